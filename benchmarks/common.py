@@ -0,0 +1,22 @@
+import statistics
+from typing import Dict, List
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Return p50/p95/p99/max of samples (in the samples' unit)"""
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    if len(samples) == 1:
+        value = samples[0]
+        return {'p50': value, 'p95': value, 'p99': value, 'max': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98], 'max': max(samples)}
+
+
+def format_ms(label: str, samples: List[float]) -> str:
+    """Format latency samples given in seconds as a one-line millisecond summary"""
+    stats = percentiles(samples)
+    return (
+        f"{label:<28} n={len(samples):<7} "
+        + "  ".join(f"{name}={value * 1000:8.3f}ms" for name, value in stats.items())
+    )
@@ -0,0 +1,118 @@
+"""
+Interaction latency with blocking SQLite calls versus the database worker thread.
+
+Simulated /remind interactions arrive at a fixed rate against a pre-populated
+database. Each one stores a reminder and lists the first page of the user's
+reminders, which is what /remind followed by /reminders costs. Latency is
+measured from arrival to completion, and a probe task measures event-loop lag,
+which is what delays the gateway heartbeat and every other interaction.
+
+Usage: python -m benchmarks.db_latency [--rows 50000] [--rate 200] [--duration 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.common import format_ms
+from utils.database import INSERT_REMINDER, SELECT_USER_REMINDERS, ReminderDatabase, migrate
+
+USERS = 1000
+PAGE_SIZE = 10
+
+
+def populate(path: str, rows: int):
+    """Fill a fresh database with future reminders spread over many users"""
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    now = int(time.time())
+    times = (now + random.randrange(1, 86400 * 30) for _ in range(rows))
+    conn.executemany(INSERT_REMINDER, (
+        (random.randrange(USERS), None, f"reminder {i}", 'dm', due, due, None, None)
+        for i, due in enumerate(times)
+    ))
+    conn.commit()
+    conn.close()
+
+
+class InlineDatabase:
+    """The previous behaviour: a new blocking connection per call, on the event loop"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def insert_reminder(self, *params) -> int:
+        conn = sqlite3.connect(self.path)
+        cursor = conn.execute(INSERT_REMINDER, params + params[-1:] + (None, None))
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    async def list_reminders(self, user_id: int, limit: int):
+        conn = sqlite3.connect(self.path)
+        rows = conn.execute(SELECT_USER_REMINDERS, (user_id, limit)).fetchall()
+        conn.close()
+        return rows
+
+
+async def interaction(db, latencies: list, arrived: float):
+    user_id = random.randrange(USERS)
+    await db.insert_reminder(user_id, None, "benchmark", 'dm', int(time.time()) + 3600)
+    await db.list_reminders(user_id, PAGE_SIZE)
+    latencies.append(time.perf_counter() - arrived)
+
+
+async def probe(lags: list, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(db, rate: float, duration: float):
+    latencies, lags = [], []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(lags, stop))
+    tasks = []
+    start = time.perf_counter()
+    count = int(rate * duration)
+    for i in range(count):
+        arrival = start + i / rate
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(interaction(db, latencies, arrival)))
+    await asyncio.gather(*tasks)
+    stop.set()
+    await prober
+    return latencies, lags
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--rate', type=float, default=200.0, help="interactions per second")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, factory in (('blocking (per-call connect)', InlineDatabase),
+                               ('worker thread', ReminderDatabase)):
+            path = os.path.join(tmp, f"{factory.__name__}.db")
+            populate(path, args.rows)
+            db = factory(path)
+            if isinstance(db, ReminderDatabase):
+                await db.open()
+            latencies, lags = await run(db, args.rate, args.duration)
+            if isinstance(db, ReminderDatabase):
+                await db.close()
+            print(label)
+            print("  " + format_ms('interaction latency', latencies))
+            print("  " + format_ms('event loop lag', lags))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Sustained write throughput with one commit per write versus group commit.
+
+Many concurrent clients each insert a reminder and then edit it, as a burst of
+/remind and /reminder_edit calls would. The same ReminderDatabase runs with
+write_batch=1 (a transaction per write) and with group commit at several
+write delays. Throughput counts writes acknowledged per second; latency is
+from submitting a write to its durable acknowledgement. Every run uses the
+same PRAGMA synchronous (FULL by default, an fsync per commit), so the
+comparison is one fsync per write against one per batch.
+
+Usage: python -m benchmarks.db_writes [--clients 256] [--writes 20000] [--delays 0,0.002,0.005]
+                                      [--synchronous FULL]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import format_ms
+from utils.database import SYNCHRONOUS_MODES, ReminderDatabase
+
+
+async def client(db: ReminderDatabase, user_id: int, writes: int, latencies: list):
+    for _ in range(writes // 2):
+        due = int(time.time()) + 3600
+        started = time.perf_counter()
+        reminder_id = await db.insert_reminder(user_id, None, "benchmark", 'dm', due)
+        latencies.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        await db.update_reminder(reminder_id, user_id, "edited", 'dm', due + 60, None)
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(path: str, clients: int, writes: int, **options):
+    db = ReminderDatabase(path, **options)
+    await db.open()
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(db, user_id, writes // clients, latencies) for user_id in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    await db.close()
+    return len(latencies) / elapsed, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=256, help="concurrent writers")
+    parser.add_argument('--writes', type=int, default=20000, help="total writes per run")
+    parser.add_argument('--delays', default='0,0.002,0.005', help="group commit delays in seconds")
+    parser.add_argument('--synchronous', default='FULL', choices=SYNCHRONOUS_MODES,
+                        help="PRAGMA synchronous for every run")
+    args = parser.parse_args()
+
+    runs = [('commit per write', {'write_delay': 0, 'write_batch': 1})]
+    runs += [(f"group commit, {float(delay) * 1000:g}ms delay", {'write_delay': float(delay)})
+             for delay in args.delays.split(',')]
+    for _, options in runs:
+        options['synchronous'] = args.synchronous
+    print(f"synchronous={args.synchronous}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (label, options) in enumerate(runs):
+            path = os.path.join(tmp, f"writes-{index}.db")
+            throughput, latencies = await run(path, args.clients, args.writes, **options)
+            print(f"{label} ({throughput:,.0f} writes/s)")
+            print("  " + format_ms('write latency', latencies))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
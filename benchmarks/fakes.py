@@ -0,0 +1,204 @@
+"""
+Stand-ins for the Discord objects the cogs touch, for running them offline.
+
+FakeBot is a real commands.Bot that never connects: cogs are added and their
+app commands registered as usual, but user and channel lookups come from
+in-memory fakes that record every message sent to them.
+"""
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+_snowflakes = itertools.count(1_000_000_000_000_000)
+
+
+class Sent:
+    """One recorded message"""
+
+    __slots__ = ('at', 'content', 'embeds')
+
+    def __init__(self, content: Optional[str], embeds: list):
+        self.at = time.time()
+        self.content = content
+        self.embeds = embeds
+
+
+class FakeMessageable:
+    """Records sends, optionally after a simulated API round trip"""
+
+    def __init__(self, id: int, latency: float = 0.0):
+        self.id = id
+        self.latency = latency
+        self.sent: List[Sent] = []
+
+    async def send(self, content: Optional[str] = None, *, embed: discord.Embed = None,
+                   embeds: list = None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent.append(Sent(content, embeds or ([embed] if embed else [])))
+
+
+class FakeUser(FakeMessageable):
+    """A user whose DMs are recorded"""
+
+    def __init__(self, id: int, latency: float = 0.0):
+        super().__init__(id, latency)
+        self.name = f"user{id}"
+        self.mention = f"<@{id}>"
+        self.bot = False
+        self.dm_channel = None
+        self.dm_opens = 0
+
+    async def create_dm(self) -> 'FakeUser':
+        """Open a DM channel; sends to it are recorded on the user"""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.dm_opens += 1
+        return self
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeChannel(FakeMessageable):
+    """A guild text channel whose messages are recorded"""
+
+    def __init__(self, id: int, guild: Optional['FakeGuild'] = None, latency: float = 0.0):
+        super().__init__(id, latency)
+        self.guild = guild
+        self.mention = f"<#{id}>"
+
+
+class FakeGuild:
+    def __init__(self, id: int):
+        self.id = id
+        self.shard_id = 0
+
+
+class FakeResponse:
+    """interaction.response: records the first reply"""
+
+    def __init__(self):
+        self.messages: List[dict] = []
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content: Optional[str] = None, **kwargs):
+        self._done = True
+        self.messages.append(dict(kwargs, content=content))
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def edit_message(self, **kwargs):
+        self._done = True
+        self.messages.append(kwargs)
+
+    async def autocomplete(self, choices):
+        self._done = True
+        self.messages.append({'choices': choices})
+
+
+class FakeFollowup:
+    """interaction.followup: records follow-up messages"""
+
+    def __init__(self):
+        self.messages: List[dict] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        self.messages.append(dict(kwargs, content=content))
+
+
+class FakeInteraction:
+    """Just enough of discord.Interaction for the slash command callbacks"""
+
+    def __init__(self, bot: 'FakeBot', user: FakeUser, channel: FakeChannel):
+        self.client = bot
+        self.user = user
+        self.channel = channel
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id if channel.guild else None
+        self.channel_id = channel.id
+        self.id = next(_snowflakes)
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+
+    @property
+    def replies(self) -> List[dict]:
+        return self.response.messages + self.followup.messages
+
+
+class FakeBot(commands.Bot):
+    """A commands.Bot that never connects and resolves users and channels from fakes"""
+
+    def __init__(self, send_latency: float = 0.0, owner_id: int = 1, cold_cache: bool = False):
+        super().__init__(command_prefix='!', intents=discord.Intents.default(),
+                         help_command=None, owner_id=owner_id)
+        self.send_latency = send_latency
+        # Whether get_user misses, as for users outside the member cache
+        self.cold_cache = cold_cache
+        self.users_by_id: Dict[int, FakeUser] = {}
+        self.channels_by_id: Dict[int, FakeChannel] = {}
+        self.guild = FakeGuild(next(_snowflakes))
+
+    def make_user(self, id: Optional[int] = None) -> FakeUser:
+        user = FakeUser(id or next(_snowflakes), self.send_latency)
+        self.users_by_id[user.id] = user
+        return user
+
+    def make_channel(self, id: Optional[int] = None) -> FakeChannel:
+        channel = FakeChannel(id or next(_snowflakes), self.guild, self.send_latency)
+        self.channels_by_id[channel.id] = channel
+        return channel
+
+    def interaction(self, user: FakeUser, channel: FakeChannel) -> FakeInteraction:
+        return FakeInteraction(self, user, channel)
+
+    def sent(self) -> List[Sent]:
+        """Every message sent to any fake user or channel"""
+        messages = []
+        for target in itertools.chain(self.users_by_id.values(), self.channels_by_id.values()):
+            messages.extend(target.sent)
+        return messages
+
+    def get_user(self, id: int):
+        return None if self.cold_cache else self.users_by_id.get(id)
+
+    async def fetch_user(self, id: int):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        user = self.users_by_id.get(id)
+        if user is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), 'Unknown User')
+        return user
+
+    def get_channel(self, id: int):
+        return self.channels_by_id.get(id)
+
+    async def fetch_channel(self, id: int):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        channel = self.channels_by_id.get(id)
+        if channel is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), 'Unknown Channel')
+        return channel
+
+    async def wait_until_ready(self):
+        return None
+
+    def is_ready(self) -> bool:
+        return True
+
+
+class _FakeHTTPResponse:
+    """The attributes discord.HTTPException reads from an aiohttp response"""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = 'Fake'
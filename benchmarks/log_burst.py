@@ -0,0 +1,100 @@
+"""
+Event-loop cost of a burst of delivery-failure logs written to a slow stream.
+
+A claimed batch whose recipients all fail logs one "Giving up on reminder"
+error per reminder from the event loop. The log stream stands in for stderr
+piped to a slow collector: every write blocks for --write-latency seconds.
+Compared are a plain StreamHandler (the old logging.basicConfig setup), the
+queue-based setup_logging() without rate limiting, and with its default
+per-template rate limit. Reported are the time the loop spent inside logging
+calls, event-loop lag while the burst is logged, and how many lines were
+written once the writer thread had drained.
+
+Usage: python -m benchmarks.log_burst [--reminders 2000] [--batch 500] [--write-latency 0.001]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.common import format_ms
+from utils.logsetup import TEXT_FORMAT, setup_logging
+
+logger = logging.getLogger('cogs.reminders')
+
+
+class SlowStream:
+    """A text stream whose every write blocks, like a full pipe to a slow reader"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lines = 0
+
+    def write(self, text: str):
+        time.sleep(self.latency)
+        self.lines += text.count('\n')
+
+    def flush(self):
+        pass
+
+
+def blocking_setup(stream: SlowStream):
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return None
+
+
+async def probe(lags: list, stop: asyncio.Event, interval: float = 0.005):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(reminders: int, batch: int):
+    """Log one failure per reminder, a claimed batch at a time, returning loop time spent logging"""
+    lags = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(lags, stop))
+    spent = 0.0
+    for start in range(0, reminders, batch):
+        started = time.perf_counter()
+        for reminder_id in range(start, min(start + batch, reminders)):
+            logger.error("Giving up on reminder %s: %s", reminder_id,
+                         f"User {reminder_id} not found for reminder {reminder_id}")
+        spent += time.perf_counter() - started
+        await asyncio.sleep(0.01)
+    stop.set()
+    await prober
+    return spent, lags
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--reminders', type=int, default=2000, help="failed reminders to log")
+    parser.add_argument('--batch', type=int, default=500, help="failures logged per claimed batch")
+    parser.add_argument('--write-latency', type=float, default=0.001, help="seconds per write")
+    args = parser.parse_args()
+
+    setups = (
+        ('blocking StreamHandler', lambda stream: blocking_setup(stream)),
+        ('queue listener', lambda stream: setup_logging(stream=stream, rate_limit=0)),
+        ('queue listener, rate limited', lambda stream: setup_logging(stream=stream)),
+    )
+    for label, setup in setups:
+        stream = SlowStream(args.write_latency)
+        listener = setup(stream)
+        spent, lags = await run(args.reminders, args.batch)
+        if listener is not None:
+            listener.stop()
+        print(f"{label} ({stream.lines} lines written, {spent * 1000:.1f}ms spent logging on the loop)")
+        print("  " + format_ms('event loop lag', lags))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
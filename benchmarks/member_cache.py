@@ -0,0 +1,99 @@
+"""
+Resident memory of the gateway cache by guild count, lean versus full member cache.
+
+Each run starts a fresh interpreter, creates the bot with the options
+main.py uses for a MEMBER_CACHE mode and feeds it GUILD_CREATE payloads the
+way the gateway would, without connecting. Every payload carries all of the
+guild's members (what chunking delivers in full mode), so lean mode is
+measured against the same input and has to drop them itself. Reported are
+the members and users left in the cache and RSS over the freshly created bot.
+
+Usage: python -m benchmarks.member_cache [--guilds 100,1000,5000] [--members 100]
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.startup import ROOT, rss_mb
+
+BOT_ID = 1 << 60
+
+
+def guild_payload(guild_id: int, members: int, first_user: int) -> dict:
+    """A GUILD_CREATE payload with one text channel and the given number of members"""
+    member_data = [{
+        'user': {'id': str(user_id), 'username': f"user{user_id}", 'discriminator': '0',
+                 'global_name': None, 'avatar': None},
+        'roles': [], 'joined_at': '2024-01-01T00:00:00+00:00', 'deaf': False, 'mute': False,
+        'flags': 0,
+    } for user_id in range(first_user, first_user + members)]
+    member_data.append({**member_data[0], 'user': {**member_data[0]['user'], 'id': str(BOT_ID)}})
+    return {
+        'id': str(guild_id), 'name': f"guild{guild_id}", 'member_count': members + 1,
+        'roles': [{'id': str(guild_id), 'name': '@everyone', 'permissions': '0', 'position': 0,
+                   'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}],
+        'channels': [{'id': str(guild_id + 1), 'type': 0, 'name': 'general', 'position': 0,
+                      'permission_overwrites': []}],
+        'members': member_data,
+    }
+
+
+def child(mode: str, guilds: int, members: int):
+    import discord
+    from discord.ext import commands
+    from utils.gateway import client_options
+
+    bot = commands.Bot(command_prefix='!', help_command=None, **client_options(mode))
+    state = bot._connection
+    # What READY would set; the bot's own member is always cached
+    state.user = discord.ClientUser(state=state, data={
+        'id': str(BOT_ID), 'username': 'bot', 'discriminator': '0', 'avatar': None, 'bot': True,
+    })
+    gc.collect()
+    baseline = rss_mb()
+
+    for index in range(guilds):
+        guild_id = (index + 1) << 22
+        state._add_guild_from_data(guild_payload(guild_id, members, index * members + 1))
+    gc.collect()
+
+    print(json.dumps({
+        'members': sum(len(guild.members) for guild in bot.guilds),
+        'users': len(bot.users),
+        'rss_mb': rss_mb(),
+        'delta_mb': rss_mb() - baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--guilds', default='100,1000,5000', help="comma-separated guild counts")
+    parser.add_argument('--members', type=int, default=100, help="members per guild")
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        mode, guilds, members = args.child
+        child(mode, int(guilds), int(members))
+        return
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    print(f"{'mode':<6} {'guilds':>7} {'membership':>11} {'cached':>9} {'users':>9} "
+          f"{'RSS':>9} {'RSS delta':>10}")
+    for guilds in (int(count) for count in args.guilds.split(',')):
+        for mode in ('full', 'lean'):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.member_cache', '--child', mode, str(guilds),
+                 str(args.members)],
+                cwd=ROOT, env=env, capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<6} {guilds:>7} {guilds * args.members:>11,} {result['members']:>9,} "
+                  f"{result['users']:>9,} {result['rss_mb']:>7.1f}MB {result['delta_mb']:>+8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Time parsing cost: dateparser versus the compiled fast path, cold and cached.
+
+Usage: python -m benchmarks.parse_time [--number 2000]
+"""
+import argparse
+import timeit
+from datetime import datetime
+
+import dateparser
+
+from utils.timeparse import parse_offset, parse_time
+
+INPUTS = (
+    '30s',
+    '2h 30m 20s',
+    '1 year 2 months 3 weeks 4 days 5 hours 10 seconds',
+    '20-09-2025 14:30',
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args()
+    now = datetime.now()
+
+    def cold(text):
+        parse_offset.cache_clear()
+        parse_time(text, now)
+
+    print(f"{'input':<52} {'dateparser':>12} {'fast (cold)':>12} {'fast (cached)':>14}")
+    for text in INPUTS:
+        slow_number = max(1, args.number // 20)
+        slow = timeit.timeit(
+            lambda: dateparser.parse(text, settings={'RELATIVE_BASE': now}), number=slow_number
+        ) / slow_number
+        fast_cold = timeit.timeit(lambda: cold(text), number=args.number) / args.number
+        fast_warm = timeit.timeit(lambda: parse_time(text, now), number=args.number) / args.number
+        print(f"{text:<52} {slow * 1e6:10.1f}us {fast_cold * 1e6:10.1f}us {fast_warm * 1e6:12.1f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Offline workload benchmark for the reminder cog.
+
+Drives ReminderSystem through FakeBot with scripted workloads and reports
+throughput, p50/p99 latency and peak traced memory for each:
+
+- remind:  concurrent /remind calls
+- list:    /reminders for users who each own many reminders
+- churn:   interleaved /reminder_edit and /reminder_delete calls
+- burst:   N reminders all due at once, bulk-loaded and then dispatched
+- autocomplete: /remind time suggestions for every keystroke of typed times
+
+Usage: python -m benchmarks.reminders [--users 500] [--commands 5000]
+                                      [--burst 10000] [--send-latency 0.0]
+                                      [--concurrency 64] [--cold-cache]
+                                      [--storage sqlite]
+                                      [--workloads remind,list,churn,burst,autocomplete]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import percentiles
+from benchmarks.fakes import FakeBot
+from benchmarks.startup import rss_mb
+from utils.storage import BACKENDS
+
+
+async def run_commands(calls: list, concurrency: int) -> list:
+    """Run command coroutine factories with bounded concurrency, returning latencies"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(call):
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(timed(call) for call in calls))
+    return latencies
+
+
+def report(name: str, count: int, elapsed: float, latencies: list, unit: str = 'ops'):
+    _, peak = tracemalloc.get_traced_memory()
+    stats = percentiles(latencies)
+    print(f"{name:<8} {count:>9} {unit:<8} {count / elapsed:>10.0f}/s  "
+          f"p50={stats['p50'] * 1000:8.2f}ms  p99={stats['p99'] * 1000:8.2f}ms  "
+          f"peak traced={peak / 1024 / 1024:7.1f}MB  rss={rss_mb():7.1f}MB")
+    tracemalloc.reset_peak()
+
+
+async def workload_remind(cog, bot, users, channel, args):
+    calls = []
+    for i in range(args.commands):
+        user = random.choice(users)
+        delivery = random.choice(('dm', 'server'))
+        interaction = bot.interaction(user, channel)
+        calls.append(lambda i=interaction, n=i, d=delivery: cog.remind.callback(
+            cog, i, f"{random.randint(1, 72)}h {random.randint(0, 59)}m", f"benchmark {n}", d
+        ))
+    started = time.perf_counter()
+    latencies = await run_commands(calls, args.concurrency)
+    report('remind', args.commands, time.perf_counter() - started, latencies)
+
+
+async def workload_list(cog, bot, users, channel, args):
+    calls = [
+        lambda i=bot.interaction(random.choice(users), channel): cog.reminders_list.callback(cog, i)
+        for _ in range(args.commands)
+    ]
+    started = time.perf_counter()
+    latencies = await run_commands(calls, args.concurrency)
+    report('list', args.commands, time.perf_counter() - started, latencies)
+
+
+async def workload_churn(cog, bot, users, channel, args):
+    owned = []
+    for user in users:
+        rows = await cog.db.list_reminders(user.id, args.commands)
+        owned.extend((row[0], user.id) for row in rows)
+    owned = random.sample(owned, min(args.commands, len(owned)))
+    calls = []
+    for reminder_id, user_id in owned:
+        interaction = bot.interaction(bot.get_user(user_id), channel)
+        if random.random() < 0.5:
+            calls.append(lambda i=interaction, r=reminder_id: cog._edit_reminder(
+                i, r, f"{random.randint(1, 72)}h", "edited", 'dm'
+            ))
+        else:
+            calls.append(lambda i=interaction, r=reminder_id: cog._delete_reminder(i, r))
+    started = time.perf_counter()
+    latencies = await run_commands(calls, args.concurrency)
+    report('churn', len(calls), time.perf_counter() - started, latencies)
+
+
+async def workload_burst(cog, bot, users, channel, args):
+    due = int(time.time()) + 2
+    await asyncio.gather(*(
+        cog.db.insert_reminder(random.choice(users).id, None, "burst", 'dm', due)
+        for _ in range(args.burst)
+    ))
+    before = len(bot.sent())
+    cog.scheduler.invalidate()
+
+    # With coalescing one message carries several reminders, one embed each
+    def delivered() -> int:
+        return sum(len(message.embeds) for message in bot.sent())
+
+    target = delivered() + args.burst
+    deadline = time.time() + args.timeout
+    while delivered() < target and time.time() < deadline:
+        await asyncio.sleep(0.05)
+    sent = sorted(bot.sent(), key=lambda message: message.at)[before:]
+    if not sent:
+        print("burst    nothing was sent before the timeout")
+        return
+    lags = [message.at - due for message in sent for _ in message.embeds]
+    elapsed = max(sent[-1].at - due, 1e-9)
+    report('burst', len(lags), elapsed, lags, unit='reminders')
+    print(f"{'':<8} messages sent: {len(sent)}, DM channels opened: {sum(user.dm_opens for user in users)}")
+
+
+async def workload_autocomplete(cog, bot, users, channel, args):
+    typed = ('2h 30m', '15m', '1 hour 20 minutes', '3d', '20-09-2025 14:30', 'tomorrow at 5pm')
+    calls = []
+    for _ in range(max(1, args.commands // 20)):
+        text = f"{random.randint(1, 72)}h {random.randint(0, 59)}m" if random.random() < 0.5 else random.choice(typed)
+        # One request per keystroke, as Discord sends them
+        for end in range(1, len(text) + 1):
+            interaction = bot.interaction(random.choice(users), channel)
+            calls.append(lambda i=interaction, t=text[:end]: cog.time_autocomplete(i, t))
+    started = time.perf_counter()
+    latencies = await run_commands(calls, args.concurrency)
+    report('autocomplete', len(calls), time.perf_counter() - started, latencies)
+
+
+WORKLOADS = {
+    'remind': workload_remind,
+    'list': workload_list,
+    'churn': workload_churn,
+    'burst': workload_burst,
+    'autocomplete': workload_autocomplete,
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--commands', type=int, default=5000, help="commands per workload")
+    parser.add_argument('--burst', type=int, default=10000, help="reminders due at once")
+    parser.add_argument('--send-latency', type=float, default=0.0,
+                        help="simulated seconds per Discord send")
+    parser.add_argument('--concurrency', type=int, default=64, help="concurrent interactions")
+    parser.add_argument('--cold-cache', action='store_true',
+                        help="users are missing from the member cache and must be fetched")
+    parser.add_argument('--timeout', type=float, default=600.0, help="burst drain timeout")
+    parser.add_argument('--storage', choices=BACKENDS, default='sqlite', help="reminder storage backend")
+    parser.add_argument('--workloads', default=','.join(WORKLOADS))
+    args = parser.parse_args()
+    os.environ['REMINDER_STORAGE'] = args.storage
+    # Measure storage and delivery, not the per-user rate limit and quota
+    os.environ.setdefault('REMINDER_COMMAND_RATE', '0')
+    os.environ.setdefault('REMINDER_MAX_PER_USER', '0')
+
+    from cogs.reminders import ReminderSystem
+
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        bot = FakeBot(send_latency=args.send_latency, cold_cache=args.cold_cache)
+        users = [bot.make_user() for _ in range(args.users)]
+        channel = bot.make_channel()
+        cog = ReminderSystem(bot)
+        await bot.add_cog(cog)
+        tracemalloc.reset_peak()
+
+        print(f"{'workload':<8} {'count':>9} {'':<8} {'throughput':>12}  latency / memory")
+        for name in args.workloads.split(','):
+            await WORKLOADS[name](cog, bot, users, channel, args)
+
+        await bot.remove_cog(cog.qualified_name)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
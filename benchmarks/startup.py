@@ -0,0 +1,102 @@
+"""
+Cold-start cost of the bot: import time and RSS per extension.
+
+Each run starts a fresh interpreter that imports discord.py, creates the bot
+and loads every extension in main.EXTENSIONS the way load_extensions does,
+recording wall time and resident memory after each step. The database is
+created in a temporary directory and the bot never connects to Discord.
+
+Usage: python -m benchmarks.startup [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    # ru_maxrss is the peak, in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+async def child(extensions: list):
+    steps = []
+
+    def record(name: str, started: float):
+        steps.append({'step': name, 'seconds': time.perf_counter() - started, 'rss_mb': rss_mb()})
+
+    record('interpreter', time.perf_counter())
+
+    started = time.perf_counter()
+    import discord
+    from discord.ext import commands
+    record('import discord.py', started)
+
+    started = time.perf_counter()
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.default(), help_command=None)
+    record('create bot', started)
+
+    for extension in extensions:
+        started = time.perf_counter()
+        await bot.load_extension(extension)
+        record(extension, started)
+
+    print(json.dumps(steps))
+    for name in list(bot.extensions):
+        await bot.unload_extension(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', nargs='*', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        asyncio.run(child(args.child))
+        return
+
+    from main import EXTENSIONS
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.startup', '--child', *EXTENSIONS],
+                cwd=tmp, env=env, capture_output=True, text=True, check=True
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'step':<24} {'time (median)':>14} {'RSS after':>10} {'RSS delta':>10}")
+    previous_rss = 0.0
+    total = 0.0
+    for index, step in enumerate(runs[0]):
+        seconds = statistics.median(run[index]['seconds'] for run in runs)
+        rss = statistics.median(run[index]['rss_mb'] for run in runs)
+        if index:
+            total += seconds
+        print(f"{step['step']:<24} {seconds * 1000:12.1f}ms {rss:8.1f}MB {rss - previous_rss:+8.1f}MB")
+        previous_rss = rss
+    print(f"{'total startup':<24} {total * 1000:12.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Reminder storage backends compared operation by operation.
+
+Runs the same workload against each backend through the ReminderStore
+interface the cog uses: concurrent stores, first-page listings, edits and
+deletes, then claiming and acknowledging every due reminder in batches.
+Throughput is operations per second (reminders per second for claim+ack).
+
+Usage: python -m benchmarks.storage [--reminders 20000] [--users 1000]
+                                    [--concurrency 64] [--backends sqlite,memory]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import percentiles
+from utils.storage import BACKENDS, create_store
+
+
+async def timed(calls: list, latencies: list, concurrency: int) -> float:
+    """Run coroutine factories with bounded concurrency and return the elapsed time"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(call):
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(call) for call in calls))
+    return time.perf_counter() - started
+
+
+async def run(store, reminders: int, users: int, concurrency: int, claim_batch: int):
+    await store.open()
+    rng = random.Random(0)
+    now = int(time.time())
+    owners = [rng.randrange(users) << 22 for _ in range(reminders)]
+    results = []
+
+    ids = []
+    latencies = []
+
+    async def insert(user_id: int, n: int):
+        ids.append((await store.insert_reminder(user_id, None, f"benchmark {n}", 'dm',
+                                                now + rng.randrange(3600)), user_id))
+
+    elapsed = await timed([lambda u=user_id, n=n: insert(u, n) for n, user_id in enumerate(owners)],
+                          latencies, concurrency)
+    results.append(('store', latencies, elapsed))
+
+    latencies = []
+    elapsed = await timed([lambda u=rng.randrange(users) << 22: store.list_reminders(u, 11)
+                           for _ in range(reminders)], latencies, concurrency)
+    results.append(('list', latencies, elapsed))
+
+    latencies = []
+    sample = rng.sample(ids, len(ids) // 2)
+    edits, deletes = sample[:len(sample) // 2], sample[len(sample) // 2:]
+    calls = [lambda r=reminder_id, u=user_id: store.update_reminder(
+                 r, u, "edited", 'dm', now + rng.randrange(3600), None)
+             for reminder_id, user_id in edits]
+    calls += [lambda r=reminder_id, u=user_id: store.delete_reminder(r, u)
+              for reminder_id, user_id in deletes]
+    rng.shuffle(calls)
+    elapsed = await timed(calls, latencies, concurrency)
+    results.append(('edit/delete', latencies, elapsed))
+
+    # Everything is due an hour from now; acknowledge each batch as sent
+    latencies = []
+    claimed = 0
+    started = time.perf_counter()
+    while True:
+        batch_started = time.perf_counter()
+        rows = await store.claim_due(now + 3600, now + 4000, claim_batch)
+        if not rows:
+            break
+        await store.ack(sent=[row[0] for row in rows])
+        latencies.append(time.perf_counter() - batch_started)
+        claimed += len(rows)
+    results.append(('claim+ack', latencies, time.perf_counter() - started, claimed))
+
+    await store.close()
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--reminders', type=int, default=20000, help="reminders stored")
+    parser.add_argument('--users', type=int, default=1000, help="distinct reminder owners")
+    parser.add_argument('--concurrency', type=int, default=64, help="concurrent operations")
+    parser.add_argument('--claim-batch', type=int, default=500, help="reminders per claim")
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends.split(','):
+            store = create_store(backend, os.path.join(tmp, f"{backend}.db"))
+            print(backend)
+            for name, latencies, elapsed, *count in await run(
+                    store, args.reminders, args.users, args.concurrency, args.claim_batch):
+                count = count[0] if count else len(latencies)
+                stats = percentiles(latencies)
+                print(f"  {name:<12} {count / elapsed:>10,.0f}/s  "
+                      f"p50={stats['p50'] * 1000:8.3f}ms  p99={stats['p99'] * 1000:8.3f}ms")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -87,14 +87,15 @@ class FunCommands(commands.Cog):
         # Reminder Commands
         embed.add_field(
             name="⏰ Reminder System",
-            value="**`/remind [time] [message] [delivery]`**\n"
-                  "Set custom reminders with flexible time formats\n\n"
+            value="**`/remind [time] [message] [delivery] [repeat]`**\n"
+                  "Set custom reminders with flexible time formats, optionally repeating\n\n"
                   "**Examples:**\n"
                   "• `/remind 30s \"Check the oven\" dm`\n"
                   "• `/remind 2h \"Team meeting\" server`\n"
                   "• `/remind 1d \"Pay bills\" dm`\n"
                   "• `/remind \"1 year 2 months 3 weeks 4 days 5 hours 10 seconds\" \"Long term goal\" server`\n"
-                  "• `/remind \"20-09-2025 14:30\" \"Important deadline\" dm`",
+                  "• `/remind \"20-09-2025 14:30\" \"Important deadline\" dm`\n"
+                  "• `/remind 1h \"Stretch\" dm \"every 2h\"`",
             inline=False
         )
         
@@ -112,7 +113,8 @@ class FunCommands(commands.Cog):
         embed.add_field(
             name="🔧 Reminder Management",
             value="**`/reminders`** - View all active reminders\n"
-                  "**`/reminder_edit [id] [new time] [new message] [new delivery]`** - Modify existing reminders\n"
+                  "**`/reminder_history`** - View recently delivered reminders\n"
+                  "**`/reminder_edit [id] [new time] [new message] [new delivery] [new repeat]`** - Modify existing reminders\n"
                   "**`/reminder_delete [id]`** - Remove reminders\n\n"
                   "**Examples:**\n"
                   "• `/reminders`\n"
@@ -1,45 +1,187 @@
 
 
+import asyncio
 import logging
-import re
-import sqlite3
-from datetime import datetime, timedelta
+import math
+import os
+import socket
+import tempfile
+import time
+import uuid
+from datetime import datetime, time as dt_time, timezone
 
-import dateparser
+import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
+from utils import timeparse, transfer
+from utils.database import STATUS_EXPIRED, STATUS_FAILED
+from utils.dispatch import ReminderDispatcher
+from utils.metrics import registry
+from utils.recurrence import parse_recurrence
+from utils.resolver import DiscordResolver
+from utils.scheduler import ReminderScheduler
+from utils.sharding import ShardFilter
+from utils.storage import create_store
+from utils.throttle import LiveCounts, TokenBuckets
+
 logger = logging.getLogger(__name__)
 
+DISPATCH_LAG = registry.histogram(
+    'reminder_dispatch_lag_seconds', "Seconds between a reminder's due time and its delivery", ['delivery']
+)
+SEND_LATENCY = registry.histogram(
+    'reminder_send_seconds', "Discord send latency per reminder", ['delivery']
+)
+PARSE_LATENCY = registry.histogram('reminder_parse_seconds', "Time string parsing latency")
+AUTOCOMPLETE_LATENCY = registry.histogram('reminder_autocomplete_seconds', "Time argument autocomplete latency")
+DELIVERIES = registry.counter(
+    'reminder_deliveries_total', "Reminder delivery attempts by outcome", ['delivery', 'outcome']
+)
+PENDING_REMINDERS = registry.gauge('reminder_pending', "Pending and in-flight reminders")
+THROTTLED = registry.counter(
+    'reminder_throttled_total', "Reminder commands rejected by rate limits and quotas", ['command', 'reason']
+)
+DISPATCH_LEADER = registry.gauge('reminder_dispatch_leader', "1 while this process dispatches reminders")
+
+# Reminders shown per /reminders page (an embed holds at most 25 fields)
+PAGE_SIZE = 10
+
+# Discord limits on one message, used when coalescing reminders
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+class ReminderUndeliverable(Exception):
+    """Raised when a reminder can never be delivered and should not be retried"""
+
+def is_transient(error: Exception) -> bool:
+    """Return whether a failed send is worth retrying"""
+    if isinstance(error, discord.HTTPException):
+        # Discord 5xx responses and rate limits that outlived discord.py's own retries
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (asyncio.TimeoutError, OSError, aiohttp.ClientError))
+
+def to_epoch(value: datetime) -> int:
+    """Convert a naive local or aware datetime to UTC epoch seconds, rounding up so reminders never fire early"""
+    return math.ceil(value.timestamp())
+
 class ReminderSystem(commands.Cog):
     """Reminder system with slash commands"""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db_path = 'reminders.db'
-        self.init_database()
+        self.shards = ShardFilter(bot.shard_count, getattr(bot, 'shard_ids', None))
+        self.storage = os.getenv('REMINDER_STORAGE', 'sqlite')
+        self.db = create_store(
+            self.storage, self.db_path, self.shards,
+            write_delay=float(os.getenv('REMINDER_WRITE_DELAY', '0')),
+            synchronous=os.getenv('REMINDER_DB_SYNCHRONOUS', 'FULL')
+        )
+        # Replicas sharing the database elect one dispatcher through a lease
+        # renewed every third of this many seconds (0: no election, always dispatch)
+        self.leader_lease = float(os.getenv('REMINDER_LEADER_LEASE', '0'))
+        self.lease_name = 'dispatch:{}:{}'.format(
+            self.shards.shard_count, ','.join(map(str, sorted(self.shards.shard_ids)))
+        )
+        self.lease_holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_renewed = 0.0
+        # Set while this process dispatches; the delivery loops wait on it
+        self.leader = asyncio.Event()
+        # Shard workers and replicas share the database, so reminders created through
+        # another process must be found by a periodic due-scan
+        self.scheduler = ReminderScheduler(
+            sync_interval=None if self.shards.owns_all and not self.leader_lease
+            else float(os.getenv('REMINDER_SYNC_INTERVAL', '5'))
+        )
+        self.resolver = DiscordResolver(
+            bot,
+            maxsize=int(os.getenv('REMINDER_RESOLVER_CACHE_SIZE', '10000')),
+            ttl=float(os.getenv('REMINDER_RESOLVER_TTL', '3600')),
+            negative_ttl=float(os.getenv('REMINDER_RESOLVER_NEGATIVE_TTL', '3600'))
+        )
+        self.dispatcher = ReminderDispatcher(
+            concurrency=int(os.getenv('REMINDER_DISPATCH_CONCURRENCY', '16'))
+        )
+        self.claim_batch = int(os.getenv('REMINDER_CLAIM_BATCH', '500'))
+        # Messages handed to the dispatcher and not yet settled, at most claim_batch,
+        # and the outcomes of settled ones waiting to be acknowledged together
+        self.in_flight = set()
+        self.send_slots = asyncio.Semaphore(self.claim_batch)
+        self.pending_acks = {kind: [] for kind in ('sent', 'retry', 'failed', 'rescheduled', 'expired', 'skipped')}
+        self.ack_flusher = None
+        self.lease_seconds = int(os.getenv('REMINDER_LEASE_SECONDS', '300'))
+        self.max_attempts = int(os.getenv('REMINDER_MAX_ATTEMPTS', '5'))
+        self.retry_backoff = int(os.getenv('REMINDER_RETRY_BACKOFF', '30'))
+        self.preload_dateparser = os.getenv('REMINDER_PRELOAD_DATEPARSER', '0') == '1'
+        # Seconds to hold a due reminder so others for the same destination can share its message
+        self.coalesce_window = float(os.getenv('REMINDER_COALESCE_WINDOW', '0'))
+        # Reminders already overdue at startup are drained oldest first at this many
+        # messages per second (0 for no cap), apart from newly due ones
+        self.backlog_rate = float(os.getenv('REMINDER_BACKLOG_RATE', '25'))
+        # Seconds overdue after which a backlog reminder is expired instead of sent (0 sends all)
+        self.backlog_expire = int(os.getenv('REMINDER_BACKLOG_EXPIRE', '0'))
+        # Seconds late after which a delivered reminder says when it was due (0 disables)
+        self.late_notice = int(os.getenv('REMINDER_LATE_NOTICE', '60'))
+        # Reminders due before this time belong to the startup backlog; 0 once it is drained
+        self.backlog_before = 0.0
+        # /remind, /reminder_edit and /reminder_delete share one token bucket per user:
+        # REMINDER_COMMAND_BURST calls at once, refilled at REMINDER_COMMAND_RATE per second
+        command_rate = float(os.getenv('REMINDER_COMMAND_RATE', '0.2'))
+        self.command_buckets = TokenBuckets(
+            command_rate, int(os.getenv('REMINDER_COMMAND_BURST', '10'))
+        ) if command_rate else None
+        # Pending reminders allowed per user and per server (0 for no limit)
+        self.max_per_user = int(os.getenv('REMINDER_MAX_PER_USER', '100'))
+        self.max_per_guild = int(os.getenv('REMINDER_MAX_PER_GUILD', '0'))
+        self.live_counts = LiveCounts(ttl=float(os.getenv('REMINDER_QUOTA_TTL', '60')))
+        # Days delivered reminders stay in /reminder_history (0 keeps them forever)
+        self.history_days = int(os.getenv('REMINDER_HISTORY_DAYS', '90'))
+        # History purge and vacuum run once a day at this UTC hour, off-peak
+        self.maintenance.change_interval(time=dt_time(
+            hour=int(os.getenv('REMINDER_MAINTENANCE_HOUR', '4')), tzinfo=timezone.utc
+        ))
+    
+    async def cog_load(self):
+        """Open the database and start the reminder dispatcher"""
+        await self.init_database()
         self.check_reminders.start()
+        self.update_metrics.start()
+        self.maintenance.start()
+        if self.leader_lease:
+            self.elect_leader.change_interval(seconds=self.leader_lease / 3)
+            self.elect_leader.start()
+        else:
+            self._take_leadership()
     
-    def init_database(self):
+    async def cog_unload(self):
+        """Stop the reminder dispatcher and close the database"""
+        self.elect_leader.cancel()
+        self.check_reminders.cancel()
+        self.drain_backlog.cancel()
+        self.update_metrics.cancel()
+        self.maintenance.cancel()
+        await self.dispatcher.close()
+        await asyncio.gather(*self.in_flight, return_exceptions=True)
+        if self.ack_flusher is not None:
+            await self.ack_flusher
+        if self.leader_lease and self.leader.is_set():
+            # Hand over straight away instead of making a standby wait out the lease
+            await self.db.release_lease(self.lease_name, self.lease_holder)
+        await self.db.close()
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Optionally warm up the natural language parser once connected"""
+        if self.preload_dateparser:
+            await asyncio.to_thread(timeparse.load_dateparser)
+            self.preload_dateparser = False
+            logger.info("Natural language time parser loaded")
+    
+    async def init_database(self):
         """Initialize SQLite database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                channel_id INTEGER,
-                message TEXT NOT NULL,
-                delivery_type TEXT NOT NULL,
-                reminder_time TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        await self.db.open()
         logger.info("Database initialized successfully")
     
     def parse_time(self, time_str: str) -> datetime:
@@ -48,106 +190,38 @@ class ReminderSystem(commands.Cog):
         Supports: seconds(s), minutes(m), hours(h), days(d), weeks(w), months(mo), years(y)
         Also supports absolute dates: DD-MM-YYYY HH:MM
         """
-        # Handle absolute date/time format (DD-MM-YYYY HH:MM)
-        if re.match(r'^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$', time_str):
-            try:
-                return datetime.strptime(time_str, '%d-%m-%Y %H:%M')
-            except ValueError:
-                raise ValueError("Invalid date format. Use DD-MM-YYYY HH:MM")
-        
-        # Handle relative time formats
-        current_time = datetime.now()
-        
-        # Simple units
-        if time_str.endswith(('s', 'm', 'h', 'd', 'w', 'mo', 'y')):
-            return self._parse_simple_units(time_str, current_time)
-        
-        # Complex durations like "1 year 2 months 3 weeks 4 days 5 hours 10 seconds"
-        return self._parse_complex_duration(time_str, current_time)
-    
-    def _parse_simple_units(self, time_str: str, current_time: datetime) -> datetime:
-        """Parse simple time units like 30s, 5m, 2h, 1d, 1w, 1mo, 1y"""
-        unit = time_str[-1]
+        started = time.perf_counter()
         try:
-            value = int(time_str[:-1])
-        except ValueError:
-            raise ValueError(f"Invalid time format: {time_str}")
-        
-        if unit == 's':
-            return current_time + timedelta(seconds=value)
-        elif unit == 'm':
-            return current_time + timedelta(minutes=value)
-        elif unit == 'h':
-            return current_time + timedelta(hours=value)
-        elif unit == 'd':
-            return current_time + timedelta(days=value)
-        elif unit == 'w':
-            return current_time + timedelta(weeks=value)
-        elif unit == 'o':  # months
-            # Approximate months as 30 days
-            return current_time + timedelta(days=value * 30)
-        elif unit == 'y':
-            # Approximate years as 365 days
-            return current_time + timedelta(days=value * 365)
-        else:
-            raise ValueError(f"Unknown time unit: {unit}")
-    
-    def _parse_complex_duration(self, time_str: str, current_time: datetime) -> datetime:
-        """Parse complex durations like '1 year 2 months 3 weeks 4 days 5 hours 10 seconds'"""
-        # Try using dateparser for natural language parsing
-        try:
-            parsed = dateparser.parse(time_str, settings={'RELATIVE_BASE': current_time})
-            if parsed:
-                return parsed
-        except Exception:
-            pass
-        
-        # Fallback to manual parsing
-        total_seconds = 0
-        
-        # Extract numbers and units
-        pattern = r'(\d+)\s*(year|month|week|day|hour|minute|second)s?'
-        matches = re.findall(pattern, time_str.lower())
-        
-        for value, unit in matches:
-            value = int(value)
-            if unit == 'second':
-                total_seconds += value
-            elif unit == 'minute':
-                total_seconds += value * 60
-            elif unit == 'hour':
-                total_seconds += value * 3600
-            elif unit == 'day':
-                total_seconds += value * 86400
-            elif unit == 'week':
-                total_seconds += value * 604800
-            elif unit == 'month':
-                total_seconds += value * 2592000  # ~30 days
-            elif unit == 'year':
-                total_seconds += value * 31536000  # ~365 days
-        
-        if total_seconds == 0:
-            raise ValueError("Could not parse time format. Please use valid units.")
-        
-        return current_time + timedelta(seconds=total_seconds)
+            return timeparse.parse_time(time_str)
+        finally:
+            PARSE_LATENCY.observe(time.perf_counter() - started)
     
     @app_commands.command(name="remind", description="Set a reminder")
     @app_commands.describe(
         time="Time until reminder (e.g., 30s, 5m, 2h, 1d, 1w, 1mo, 1y, or '1 year 2 months 3 weeks 4 days 5 hours 10 seconds', or absolute date like '20-09-2025 14:30')",
         message="What to remind you about",
-        delivery="How to deliver the reminder: 'dm' or 'server'"
+        delivery="How to deliver the reminder: 'dm' or 'server'",
+        repeat="Optional: repeat after the first reminder (e.g., 'every day', 'weekdays', 'every mon, fri', or cron '0 9 * * 1-5')"
     )
     async def remind(
         self, 
         interaction: discord.Interaction, 
         time: str, 
         message: str, 
-        delivery: str
+        delivery: str,
+        repeat: str = None
     ):
         """Set a new reminder"""
+        if await self._throttled(interaction, 'remind'):
+            return
         try:
             # Parse the time
             reminder_time = self.parse_time(time)
+            recurrence = repeat.strip().lower() if repeat else None
+            rule = parse_recurrence(recurrence) if recurrence else None
+            if rule:
+                # Make sure the series can continue after the first reminder
+                rule.next_after(to_epoch(reminder_time), to_epoch(reminder_time))
             
             # Validate delivery type
             if delivery.lower() not in ['dm', 'server']:
@@ -157,14 +231,24 @@ class ReminderSystem(commands.Cog):
                 )
                 return
             
+            guild_id = interaction.guild_id if delivery.lower() == 'server' else None
+            if await self._over_quota(interaction, guild_id):
+                return
+            
             # Store reminder in database
-            reminder_id = self._store_reminder(
-                user_id=interaction.user.id,
-                channel_id=interaction.channel.id if delivery.lower() == 'server' else None,
-                message=message,
-                delivery_type=delivery.lower(),
-                reminder_time=reminder_time
-            )
+            try:
+                reminder_id = await self._store_reminder(
+                    user_id=interaction.user.id,
+                    channel_id=interaction.channel.id if delivery.lower() == 'server' else None,
+                    message=message,
+                    delivery_type=delivery.lower(),
+                    reminder_time=reminder_time,
+                    guild_id=guild_id,
+                    recurrence=recurrence
+                )
+            except Exception:
+                self._release_quota(interaction.user.id, guild_id)
+                raise
             
             # Format time for display
             time_until = reminder_time - datetime.now()
@@ -179,7 +263,8 @@ class ReminderSystem(commands.Cog):
             
             await interaction.response.send_message(
                 f"✅ Reminder set! I'll remind you about '{message}' in {time_display}.\n"
-                f"Reminder ID: {reminder_id}",
+                + (f"🔁 Repeats {rule.describe()}.\n" if rule else "")
+                + f"Reminder ID: {reminder_id}",
                 ephemeral=True
             )
             
@@ -189,30 +274,83 @@ class ReminderSystem(commands.Cog):
                 ephemeral=True
             )
         except Exception as e:
-            logger.error(f"Error setting reminder: {e}")
+            logger.error("Error setting reminder: %s", e)
             await interaction.response.send_message(
                 "❌ An error occurred while setting the reminder.",
                 ephemeral=True
             )
     
-    def _store_reminder(self, user_id: int, channel_id: int, message: str, 
-                        delivery_type: str, reminder_time: datetime) -> int:
-        """Store reminder in database and return the ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Convert datetime to ISO format string for SQLite storage
-        reminder_time_str = reminder_time.isoformat()
+    async def _throttled(self, interaction: discord.Interaction, command: str) -> bool:
+        """Reject the command if the user is out of tokens, before touching the database"""
+        if self.command_buckets is None:
+            return False
+        retry_after = self.command_buckets.take(interaction.user.id)
+        if not retry_after:
+            return False
+        THROTTLED.inc(command=command, reason='rate')
+        await interaction.response.send_message(
+            f"⏳ You're changing reminders too quickly. Try again in {math.ceil(retry_after)}s.",
+            ephemeral=True
+        )
+        return True
+    
+    async def _over_quota(self, interaction: discord.Interaction, guild_id: int = None,
+                          command: str = 'remind', count_user: bool = True) -> bool:
+        """
+        Reserve quota for one more live reminder, or reject the command if the
+        user (when count_user) or the server is already at its limit.
         
-        cursor.execute('''
-            INSERT INTO reminders (user_id, channel_id, message, delivery_type, reminder_time)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, channel_id, message, delivery_type, reminder_time_str))
+        A reservation that is not followed by a successful write must be
+        returned with _release_quota().
+        """
+        user_id = interaction.user.id
+        if count_user and self.max_per_user and not await self.live_counts.reserve(
+                ('user', user_id), self.max_per_user, lambda: self.db.count_user_live(user_id)):
+            THROTTLED.inc(command=command, reason='user_quota')
+            await interaction.response.send_message(
+                f"❌ You already have {self.max_per_user} pending reminders. "
+                "Delete some with /reminder_delete before adding more.",
+                ephemeral=True
+            )
+            return True
+        if self.max_per_guild and guild_id is not None and not await self.live_counts.reserve(
+                ('guild', guild_id), self.max_per_guild, lambda: self.db.count_guild_live(guild_id)):
+            if count_user:
+                self._release_quota(user_id)
+            THROTTLED.inc(command=command, reason='guild_quota')
+            await interaction.response.send_message(
+                f"❌ This server already has {self.max_per_guild} pending reminders. "
+                "Use a DM reminder or try again later.",
+                ephemeral=True
+            )
+            return True
+        return False
+    
+    def _release_quota(self, user_id: int = None, guild_id: int = None):
+        """Take one live reminder off the cached user and server counts"""
+        if user_id is not None:
+            self.live_counts.adjust(('user', user_id), -1)
+        if guild_id is not None:
+            self.live_counts.adjust(('guild', guild_id), -1)
+    
+    async def _quota_state(self, reminder_id: int, user_id: int) -> tuple:
+        """Return (guild_id, status) of a reminder whose change may affect quotas, if quotas are on"""
+        if not self.max_per_user and not self.max_per_guild:
+            return None
+        return await self.db.reminder_state(reminder_id, user_id)
+    
+    async def _store_reminder(self, user_id: int, channel_id: int, message: str, 
+                              delivery_type: str, reminder_time: datetime,
+                              guild_id: int = None, recurrence: str = None) -> int:
+        """Store reminder in database and return the ID"""
+        # Convert datetime to UTC epoch seconds for SQLite storage
+        reminder_epoch = to_epoch(reminder_time)
         
-        reminder_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        reminder_id = await self.db.insert_reminder(
+            user_id, channel_id, message, delivery_type, reminder_epoch, guild_id, recurrence
+        )
         
+        self.scheduler.schedule(reminder_id, reminder_epoch)
         return reminder_id
     
     @app_commands.command(name="reminders", description="List all your active reminders")
@@ -220,12 +358,41 @@ class ReminderSystem(commands.Cog):
         """List all active reminders for the user"""
         await self._list_reminders(interaction)
     
+    @app_commands.command(name="reminder_history", description="Show your recently delivered reminders")
+    async def reminder_history(self, interaction: discord.Interaction):
+        """Show the user's most recently delivered reminders"""
+        rows = await self.db.list_history(interaction.user.id, PAGE_SIZE)
+        if not rows:
+            await interaction.response.send_message(
+                "📭 None of your reminders have been delivered yet.",
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="📜 Recently Delivered Reminders",
+            color=discord.Color.blue()
+        )
+        for reminder_id, message, delivery_type, reminder_time, delivered_at in rows:
+            embed.add_field(
+                name=f"ID: {reminder_id}",
+                value=f"**Message:** {message}\n"
+                      f"**Delivery:** {delivery_type}\n"
+                      f"**Due:** <t:{reminder_time}:f>\n"
+                      f"**Delivered:** <t:{delivered_at}:R>",
+                inline=False
+            )
+        if self.history_days:
+            embed.set_footer(text=f"Delivered reminders are kept for {self.history_days} days")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="reminder_edit", description="Edit an existing reminder")
     @app_commands.describe(
         reminder_id="ID of the reminder to edit",
         new_time="New time for the reminder",
         new_message="New message for the reminder",
-        new_delivery="New delivery method: 'dm' or 'server'"
+        new_delivery="New delivery method: 'dm' or 'server'",
+        new_repeat="Optional: new repeat rule, or 'none' to stop repeating (unchanged if omitted)"
     )
     async def reminder_edit(
         self,
@@ -233,10 +400,28 @@ class ReminderSystem(commands.Cog):
         reminder_id: int,
         new_time: str,
         new_message: str,
-        new_delivery: str
+        new_delivery: str,
+        new_repeat: str = None
     ):
         """Edit an existing reminder"""
-        await self._edit_reminder(interaction, reminder_id, new_time, new_message, new_delivery)
+        if await self._throttled(interaction, 'reminder_edit'):
+            return
+        await self._edit_reminder(
+            interaction, reminder_id, new_time, new_message, new_delivery, new_repeat
+        )
+    
+    @remind.autocomplete('time')
+    @reminder_edit.autocomplete('new_time')
+    async def time_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggest times as they are typed, showing when each one resolves to"""
+        started = time.perf_counter()
+        try:
+            return [
+                app_commands.Choice(name=name, value=value)
+                for name, value in timeparse.suggest_times(current)
+            ]
+        finally:
+            AUTOCOMPLETE_LATENCY.observe(time.perf_counter() - started)
     
     @app_commands.command(name="reminder_delete", description="Delete a reminder")
     @app_commands.describe(
@@ -248,43 +433,158 @@ class ReminderSystem(commands.Cog):
         reminder_id: int
     ):
         """Delete a reminder"""
+        if await self._throttled(interaction, 'reminder_delete'):
+            return
         await self._delete_reminder(interaction, reminder_id)
     
-    async def _list_reminders(self, interaction: discord.Interaction):
-        """List all active reminders for the user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    @app_commands.command(name="reminders_export", description="Export reminders as JSONL or CSV (owner only)")
+    @app_commands.describe(
+        user="Optional: only export this user's reminders",
+        file_format="File format: 'jsonl' (default) or 'csv'"
+    )
+    async def reminders_export(
+        self,
+        interaction: discord.Interaction,
+        user: discord.User = None,
+        file_format: str = 'jsonl'
+    ):
+        """Export reminders to a file attachment"""
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                "❌ Only the bot owner can use this command.",
+                ephemeral=True
+            )
+            return
+        
+        if self.storage != 'sqlite':
+            await interaction.response.send_message(
+                "❌ Import and export need the SQLite storage backend.",
+                ephemeral=True
+            )
+            return
+        
+        if file_format.lower() not in transfer.FORMATS:
+            await interaction.response.send_message(
+                "❌ Invalid file format. Use 'jsonl' or 'csv'.",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        fmt = file_format.lower()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"reminders.{fmt}")
+            try:
+                # A separate connection streams the rows so reminders keep flowing meanwhile
+                count = await asyncio.to_thread(
+                    transfer.export_file, self.db_path, path, fmt, user.id if user else None
+                )
+            except Exception as e:
+                logger.error("Error exporting reminders: %s", e)
+                await interaction.followup.send("❌ An error occurred while exporting reminders.", ephemeral=True)
+                return
+            
+            limit = interaction.guild.filesize_limit if interaction.guild else 10 * 1024 * 1024
+            if os.path.getsize(path) > limit:
+                await interaction.followup.send(
+                    f"❌ The export of {count} reminders is too large to upload. "
+                    f"Use `python -m utils.transfer export` on the host instead.",
+                    ephemeral=True
+                )
+                return
+            
+            await interaction.followup.send(
+                f"📦 Exported {count} reminders.",
+                file=discord.File(path, filename=f"reminders.{fmt}"),
+                ephemeral=True
+            )
+    
+    @app_commands.command(name="reminders_import", description="Import reminders from a JSONL or CSV export (owner only)")
+    @app_commands.describe(
+        file="A .jsonl or .csv file in the /reminders_export format"
+    )
+    async def reminders_import(
+        self,
+        interaction: discord.Interaction,
+        file: discord.Attachment
+    ):
+        """Import reminders from a file attachment"""
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                "❌ Only the bot owner can use this command.",
+                ephemeral=True
+            )
+            return
+        
+        if self.storage != 'sqlite':
+            await interaction.response.send_message(
+                "❌ Import and export need the SQLite storage backend.",
+                ephemeral=True
+            )
+            return
         
-        current_time = datetime.now().isoformat()
+        await interaction.response.defer(ephemeral=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "import")
+            try:
+                await file.save(path)
+                imported, skipped, errors = await asyncio.to_thread(
+                    transfer.import_file, self.db_path, path, transfer.format_for(file.filename)
+                )
+            except Exception as e:
+                logger.error("Error importing reminders: %s", e)
+                await interaction.followup.send("❌ An error occurred while importing reminders.", ephemeral=True)
+                return
         
-        cursor.execute('''
-            SELECT id, message, delivery_type, reminder_time, created_at
-            FROM reminders 
-            WHERE user_id = ? AND reminder_time > ?
-            ORDER BY reminder_time ASC
-        ''', (interaction.user.id, current_time))
+        # Imported reminders may be due before the scheduler's next refresh
+        self.scheduler.invalidate()
         
-        reminders = cursor.fetchall()
-        conn.close()
+        summary = f"📥 Imported {imported} reminders."
+        if skipped:
+            summary += f"\nSkipped {skipped} invalid rows:\n" + "\n".join(errors[:5])
+        await interaction.followup.send(summary[:2000], ephemeral=True)
+    
+    async def _list_reminders(self, interaction: discord.Interaction):
+        """List the user's reminders one page at a time"""
+        pages = ReminderPages(self, interaction.user.id)
+        embed = await pages.load()
         
-        if not reminders:
+        if embed is None:
             await interaction.response.send_message(
                 "📝 You have no active reminders.",
                 ephemeral=True
             )
             return
         
+        if pages.is_single_page():
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        pages.interaction = interaction
+        await interaction.response.send_message(embed=embed, view=pages, ephemeral=True)
+    
+    def _build_reminders_embed(self, rows: list, page: int, paged: bool) -> discord.Embed:
+        """Build the /reminders embed for one page of rows"""
         embed = discord.Embed(
             title="📝 Your Active Reminders",
             color=discord.Color.blue()
         )
+        if paged:
+            embed.set_footer(text=f"Page {page}")
         
-        for reminder_id, message, delivery_type, reminder_time, created_at in reminders:
+        for reminder_id, message, delivery_type, reminder_time, created_at, status, recurrence in rows:
             try:
-                reminder_dt = datetime.fromisoformat(reminder_time)
+                reminder_dt = datetime.fromtimestamp(reminder_time)
+                created_dt = datetime.fromtimestamp(created_at)
                 time_until = reminder_dt - datetime.now()
                 
-                if time_until.total_seconds() < 60:
+                if status == STATUS_FAILED:
+                    time_display = "❌ delivery failed"
+                elif status == STATUS_EXPIRED:
+                    time_display = "⌛ expired, missed while the bot was offline"
+                elif time_until.total_seconds() <= 0:
+                    time_display = "due now, delivering"
+                elif time_until.total_seconds() < 60:
                     time_display = f"{int(time_until.total_seconds())} seconds"
                 elif time_until.total_seconds() < 3600:
                     time_display = f"{int(time_until.total_seconds() // 60)} minutes"
@@ -293,27 +593,42 @@ class ReminderSystem(commands.Cog):
                 else:
                     time_display = f"{int(time_until.total_seconds() // 86400)} days"
                 
+                repeat_display = ""
+                if recurrence:
+                    repeat_display = f"**Repeats:** {parse_recurrence(recurrence).describe()}\n"
+                
                 embed.add_field(
                     name=f"ID: {reminder_id}",
                     value=f"**Message:** {message}\n"
                           f"**Delivery:** {delivery_type}\n"
                           f"**Time until:** {time_display}\n"
-                          f"**Created:** {created_at}",
+                          f"{repeat_display}"
+                          f"**Created:** {created_dt:%Y-%m-%d %H:%M:%S}",
                     inline=False
                 )
             except Exception as e:
-                logger.error(f"Error processing reminder {reminder_id}: {e}")
+                logger.error("Error processing reminder %s: %s", reminder_id, e)
                 continue
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return embed
     
     async def _edit_reminder(self, interaction: discord.Interaction, reminder_id: int, 
-                            new_time: str, new_message: str, new_delivery: str):
+                            new_time: str, new_message: str, new_delivery: str,
+                            new_repeat: str = None):
         """Edit an existing reminder"""
         try:
             # Parse new time
             new_reminder_time = self.parse_time(new_time)
             
+            # None keeps the current repeat rule, '' removes it
+            recurrence = new_repeat.strip().lower() if new_repeat else None
+            if recurrence in ('none', 'off', 'never'):
+                recurrence = ''
+            elif recurrence:
+                parse_recurrence(recurrence).next_after(
+                    to_epoch(new_reminder_time), to_epoch(new_reminder_time)
+                )
+            
             # Validate delivery type
             if new_delivery.lower() not in ['dm', 'server']:
                 await interaction.response.send_message(
@@ -323,34 +638,45 @@ class ReminderSystem(commands.Cog):
                 return
             
             # Update reminder in database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            new_reminder_time_str = new_reminder_time.isoformat()
+            new_reminder_epoch = to_epoch(new_reminder_time)
+            new_guild_id = interaction.guild_id if new_delivery.lower() == 'server' else None
+            state = await self._quota_state(reminder_id, interaction.user.id)
+            old_guild_id, old_status = state or (None, None)
+            # An edit makes the reminder pending again: a failed or expired one counts
+            # against both quotas anew, and a live one that changes server moves count
+            revived = old_status in (STATUS_FAILED, STATUS_EXPIRED)
+            reserved_guild_id = new_guild_id if revived or new_guild_id != old_guild_id else None
+            if state and await self._over_quota(
+                    interaction, reserved_guild_id, command='reminder_edit', count_user=revived):
+                return
+            reserved_user_id = interaction.user.id if revived else None
             
-            cursor.execute('''
-                UPDATE reminders 
-                SET message = ?, delivery_type = ?, reminder_time = ?, channel_id = ?
-                WHERE id = ? AND user_id = ?
-            ''', (
-                new_message, 
-                new_delivery.lower(), 
-                new_reminder_time_str,
-                interaction.channel.id if new_delivery.lower() == 'server' else None,
-                reminder_id, 
-                interaction.user.id
-            ))
+            try:
+                updated = await self.db.update_reminder(
+                    reminder_id,
+                    interaction.user.id,
+                    new_message,
+                    new_delivery.lower(),
+                    new_reminder_epoch,
+                    interaction.channel.id if new_delivery.lower() == 'server' else None,
+                    new_guild_id,
+                    recurrence
+                )
+            except Exception:
+                self._release_quota(reserved_user_id, reserved_guild_id)
+                raise
             
-            if cursor.rowcount == 0:
-                conn.close()
+            if updated == 0:
+                self._release_quota(reserved_user_id, reserved_guild_id)
                 await interaction.response.send_message(
                     "❌ Reminder not found or you don't have permission to edit it.",
                     ephemeral=True
                 )
                 return
             
-            conn.commit()
-            conn.close()
+            self.scheduler.schedule(reminder_id, new_reminder_epoch)
+            if state and not revived and old_guild_id != new_guild_id:
+                self._release_quota(guild_id=old_guild_id)
             
             await interaction.response.send_message(
                 f"✅ Reminder {reminder_id} updated successfully!",
@@ -363,7 +689,7 @@ class ReminderSystem(commands.Cog):
                 ephemeral=True
             )
         except Exception as e:
-            logger.error(f"Error editing reminder: {e}")
+            logger.error("Error editing reminder: %s", e)
             await interaction.response.send_message(
                 "❌ An error occurred while editing the reminder.",
                 ephemeral=True
@@ -371,106 +697,428 @@ class ReminderSystem(commands.Cog):
     
     async def _delete_reminder(self, interaction: discord.Interaction, reminder_id: int):
         """Delete a reminder"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DELETE FROM reminders 
-            WHERE id = ? AND user_id = ?
-        ''', (reminder_id, interaction.user.id))
+        state = await self._quota_state(reminder_id, interaction.user.id)
+        deleted = await self.db.delete_reminder(reminder_id, interaction.user.id)
         
-        if cursor.rowcount == 0:
-            conn.close()
+        if deleted == 0:
             await interaction.response.send_message(
                 "❌ Reminder not found or you don't have permission to delete it.",
                 ephemeral=True
             )
             return
         
-        conn.commit()
-        conn.close()
+        self.scheduler.cancel(reminder_id)
+        # Failed and expired reminders were never counted against the quotas
+        if state and state[1] not in (STATUS_FAILED, STATUS_EXPIRED):
+            self._release_quota(interaction.user.id, state[0])
         
         await interaction.response.send_message(
             f"✅ Reminder {reminder_id} deleted successfully!",
             ephemeral=True
         )
     
-    @tasks.loop(seconds=30)
+    def _take_leadership(self):
+        """Start dispatching; reminders overdue by now are drained as a backlog"""
+        self.backlog_before = time.time()
+        self.scheduler.invalidate()
+        self.leader.set()
+        DISPATCH_LEADER.set(1)
+        if not self.drain_backlog.is_running():
+            self.drain_backlog.start()
+    
+    def _step_down(self):
+        """Stop dispatching after the batch in flight"""
+        self.leader.clear()
+        DISPATCH_LEADER.set(0)
+        self.scheduler.invalidate()
+    
+    @tasks.loop(seconds=5)
+    async def elect_leader(self):
+        """Take or renew the dispatch lease, starting or stopping delivery as it changes hands"""
+        try:
+            acquired = await self.db.acquire_lease(self.lease_name, self.lease_holder, self.leader_lease)
+        except Exception as e:
+            logger.error("Error renewing the dispatch lease: %s", e)
+            # Keep dispatching only while the lease last renewed is certainly still ours
+            acquired = self.leader.is_set() and time.monotonic() - self.lease_renewed < self.leader_lease * 2 / 3
+        else:
+            if acquired:
+                self.lease_renewed = time.monotonic()
+        
+        if acquired and not self.leader.is_set():
+            logger.info("Took the dispatch lease %s as %s", self.lease_name, self.lease_holder)
+            self._take_leadership()
+        elif not acquired and self.leader.is_set():
+            logger.warning("Lost the dispatch lease %s; standing by", self.lease_name)
+            self._step_down()
+    
+    @tasks.loop()
     async def check_reminders(self):
-        """Check for due reminders every 30 seconds"""
+        """Sleep until the next reminder is due, then dispatch everything that is due"""
+        await self.leader.wait()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            now = time.time()
+            if now >= self.scheduler.horizon:
+                await self._refill_scheduler(now)
             
-            current_time = datetime.now().isoformat()
+            due_ids = self.scheduler.pop_due(now)
+            if due_ids and self.coalesce_window:
+                # Let reminders due moments later join the same messages
+                await asyncio.sleep(self.coalesce_window)
+                now = time.time()
             
-            # Get all due reminders
-            cursor.execute('''
-                SELECT id, user_id, channel_id, message, delivery_type
-                FROM reminders 
-                WHERE reminder_time <= ?
-            ''', (current_time,))
-            
-            due_reminders = cursor.fetchall()
+            if due_ids or self.scheduler.sync_interval:
+                await self._dispatch_due_reminders(now)
+        except Exception as e:
+            logger.error("Error checking reminders: %s", e)
+            # The horizon was not advanced, so back off instead of retrying at once
+            await asyncio.sleep(5)
+            return
+        
+        await self.scheduler.sleep()
+    
+    async def _refill_scheduler(self, now: float):
+        """Load reminders due before the next scheduler horizon"""
+        # The startup backlog is streamed by drain_backlog, never held in the heap
+        rows = await self.db.fetch_schedule(now + self.scheduler.window, since=self.backlog_before)
+        self.scheduler.reset(now, rows)
+    
+    async def _dispatch_due_reminders(self, now: float):
+        """Claim, send and acknowledge due reminders in batches until none are due"""
+        while self.leader.is_set():
+            lease_until = int(now) + self.lease_seconds
+            # The startup backlog is left to drain_backlog so it cannot delay these
+            due_reminders = await self.db.claim_due(
+                now, lease_until, self.claim_batch, since=self.backlog_before
+            )
+            if not due_reminders:
+                return
             
-            for reminder_id, user_id, channel_id, message, delivery_type in due_reminders:
-                await self._send_reminder(reminder_id, user_id, channel_id, message, delivery_type)
-                
-                # Delete the sent reminder
-                cursor.execute('DELETE FROM reminders WHERE id = ?', (reminder_id,))
+            await self._deliver_claimed(due_reminders, lease_until)
+            now = time.time()
+    
+    @tasks.loop()
+    async def drain_backlog(self):
+        """Send reminders that were overdue at startup, oldest first and at a capped rate"""
+        await self.leader.wait()
+        try:
+            started = time.monotonic()
+            now = time.time()
+            lease_until = int(now) + self.lease_seconds
+            limit = self.claim_batch
+            if self.backlog_rate:
+                # About one second of sends per batch
+                limit = min(limit, max(1, int(self.backlog_rate)))
+            backlog = await self.db.claim_due(self.backlog_before, lease_until, limit)
+            if not backlog:
+                if self.backlog_before:
+                    logger.info("Caught up on reminders that were overdue at startup")
+                self.backlog_before = 0.0
+                self.drain_backlog.stop()
+                return
             
-            conn.commit()
-            conn.close()
+            expired = []
+            if self.backlog_expire:
+                expired = [row for row in backlog if now - row[5] > self.backlog_expire]
+                backlog = [row for row in backlog if now - row[5] <= self.backlog_expire]
+            messages = await self._deliver_claimed(backlog, lease_until, expired)
             
+            if self.backlog_rate:
+                await asyncio.sleep(max(0.0, messages / self.backlog_rate - (time.monotonic() - started)))
         except Exception as e:
-            logger.error(f"Error checking reminders: {e}")
+            logger.error("Error draining overdue reminders: %s", e)
+            await asyncio.sleep(5)
     
-    async def _send_reminder(self, reminder_id: int, user_id: int, channel_id: int, 
-                            message: str, delivery_type: str):
-        """Send a reminder to the user"""
+    async def _deliver_claimed(self, due_reminders: list, lease_until: int, expired: list = ()) -> int:
+        """
+        Hand claimed reminders to the dispatcher and expire the ones too overdue
+        to send. Returns the number of messages queued.
+        
+        Each message is acknowledged as soon as its own send finishes, so a slow
+        or rate-limited destination never holds up the rest of the batch. This
+        only waits while claim_batch messages are already in flight.
+        """
+        # Fan out across destinations; each DM user or channel is sent to in order
+        for reminder_id, *_ in (*due_reminders, *expired):
+            self.scheduler.schedule(reminder_id, lease_until)
+        messages = self._group_messages(due_reminders)
+        for route, rows, embeds in messages:
+            await self.send_slots.acquire()
+            task = asyncio.create_task(
+                self._settle(rows, self.dispatcher.submit(route, self._deliver, rows, embeds))
+            )
+            self.in_flight.add(task)
+            task.add_done_callback(self._settled)
+        
+        # A recurring reminder skips the missed occurrence instead of expiring
+        dropped, skipped = [], []
+        for reminder_id, _, _, _, delivery_type, reminder_time, _, recurrence in expired:
+            DELIVERIES.inc(delivery=delivery_type, outcome='expired')
+            next_due = self._next_occurrence(reminder_id, recurrence, reminder_time) if recurrence else None
+            if next_due is not None:
+                skipped.append((reminder_id, next_due))
+                self.scheduler.schedule(reminder_id, next_due)
+            else:
+                dropped.append(reminder_id)
+                self.scheduler.cancel(reminder_id)
+        self._queue_ack(expired=dropped, skipped=skipped)
+        return len(messages)
+    
+    def _settled(self, task: asyncio.Task):
+        """Free the send slot of a message whose outcome has been queued"""
+        self.in_flight.discard(task)
+        self.send_slots.release()
+    
+    async def _settle(self, rows: list, future: asyncio.Future):
+        """Wait for one message's send and queue the outcome of each reminder in it"""
         try:
-            user = self.bot.get_user(user_id)
-            if not user:
-                logger.warning(f"User {user_id} not found for reminder {reminder_id}")
-                return
-            
-            if delivery_type == "dm":
-                # Send DM
-                try:
-                    embed = discord.Embed(
-                        title="⏰ Reminder!",
-                        description=message,
-                        color=discord.Color.green(),
-                        timestamp=datetime.now()
-                    )
-                    embed.set_footer(text=f"Reminder ID: {reminder_id}")
-                    await user.send(embed=embed)
-                except discord.Forbidden:
-                    logger.warning(f"Cannot send DM to user {user_id}")
+            result = await future
+        except asyncio.CancelledError:
+            # Shutting down; the lease makes these due again on the next start
+            raise
+        except Exception as e:
+            result = e
+        
+        sent, retry, failed, rescheduled = [], [], [], []
+        for reminder_id, _, _, _, delivery_type, reminder_time, attempts, recurrence in rows:
+            next_due = None
+            if recurrence and not isinstance(result, Exception):
+                next_due = self._next_occurrence(reminder_id, recurrence, reminder_time)
             
-            elif delivery_type == "server":
-                # Send in channel and ping user
-                if channel_id:
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        embed = discord.Embed(
-                            title="⏰ Reminder!",
-                            description=message,
-                            color=discord.Color.green(),
-                            timestamp=datetime.now()
-                        )
-                        embed.set_footer(text=f"Reminder ID: {reminder_id}")
-                        await channel.send(f"{user.mention}", embed=embed)
-                    else:
-                        logger.warning(f"Channel {channel_id} not found for reminder {reminder_id}")
+            if next_due is not None:
+                DELIVERIES.inc(delivery=delivery_type, outcome='sent')
+                rescheduled.append((reminder_id, next_due))
+                self.scheduler.schedule(reminder_id, next_due)
+            elif not isinstance(result, Exception):
+                DELIVERIES.inc(delivery=delivery_type, outcome='sent')
+                sent.append(reminder_id)
+                self.scheduler.cancel(reminder_id)
+            elif is_transient(result) and attempts + 1 < self.max_attempts:
+                DELIVERIES.inc(delivery=delivery_type, outcome='retried')
+                delay = min(self.retry_backoff * 2 ** attempts, 3600)
+                retry_at = int(time.time()) + delay
+                logger.warning("Retrying reminder %s in %ss after attempt %s failed: %s", reminder_id, delay, attempts + 1, result)
+                retry.append((reminder_id, retry_at))
+                self.scheduler.schedule(reminder_id, retry_at)
+            else:
+                DELIVERIES.inc(delivery=delivery_type, outcome='failed')
+                logger.error("Giving up on reminder %s: %s", reminder_id, result)
+                failed.append(reminder_id)
+                self.scheduler.cancel(reminder_id)
+        self._queue_ack(sent=sent, retry=retry, failed=failed, rescheduled=rescheduled)
+    
+    def _queue_ack(self, **outcomes: list):
+        """Queue delivery outcomes to be acknowledged with any others that settle meanwhile"""
+        for kind, reminders in outcomes.items():
+            self.pending_acks[kind].extend(reminders)
+        if any(self.pending_acks.values()) and (self.ack_flusher is None or self.ack_flusher.done()):
+            self.ack_flusher = asyncio.create_task(self._flush_acks())
+    
+    async def _flush_acks(self):
+        """Acknowledge queued outcomes, one transaction per round, until none are left"""
+        while any(self.pending_acks.values()):
+            outcomes = self.pending_acks
+            self.pending_acks = {kind: [] for kind in outcomes}
+            try:
+                await self.db.ack(**outcomes)
+            except Exception as e:
+                # Unacknowledged reminders become due again when their lease expires
+                logger.error("Error acknowledging reminders: %s", e)
+    
+    def _next_occurrence(self, reminder_id: int, recurrence: str, reminder_time: int):
+        """Return when a recurring reminder fires next, or None to let it end"""
+        try:
+            return parse_recurrence(recurrence).next_after(reminder_time, time.time())
+        except ValueError as e:
+            logger.error("Ending recurring reminder %s: %s", reminder_id, e)
+            return None
+    
+    def _group_messages(self, due_reminders: list) -> list:
+        """
+        Split claimed reminders into (route, rows, embeds) messages.
+        
+        Each reminder is its own message unless coalescing is enabled, in which
+        case reminders for the same destination share a message up to Discord's
+        per-message embed limits.
+        """
+        messages = []
+        open_messages = {}
+        for row in due_reminders:
+            reminder_id, user_id, channel_id, message, delivery_type, reminder_time, *_ = row
+            route = ('channel', channel_id) if delivery_type == 'server' else ('dm', user_id)
+            embed = self._build_reminder_embed(reminder_id, message, reminder_time)
             
+            current = open_messages.get(route) if self.coalesce_window else None
+            if (current is None
+                    or len(current[1]) >= MAX_EMBEDS_PER_MESSAGE
+                    or sum(map(len, current[2])) + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE):
+                current = open_messages[route] = (route, [], [])
+                messages.append(current)
+            current[1].append(row)
+            current[2].append(embed)
+        return messages
+    
+    async def _deliver(self, rows: list, embeds: list):
+        """Send one message of reminders, recording send latency and how late each was delivered"""
+        _, user_id, channel_id, _, delivery_type, *_ = rows[0]
+        # A channel message pings everyone it reminds
+        user_ids = list(dict.fromkeys(row[1] for row in rows))
+        started = time.perf_counter()
+        await self._send_reminder(rows[0][0], user_ids, channel_id, embeds, delivery_type)
+        SEND_LATENCY.observe(time.perf_counter() - started, delivery=delivery_type)
+        for _, _, _, _, _, reminder_time, *_ in rows:
+            DISPATCH_LAG.observe(max(0.0, time.time() - reminder_time), delivery=delivery_type)
+    
+    @tasks.loop(hours=24)
+    async def maintenance(self):
+        """Purge history and dead reminders past their retention and return free pages to the file system"""
+        # The tables are shared by every shard worker and replica, so only the
+        # dispatcher for shard 0 maintains them
+        if not self.leader.is_set() or 0 not in self.shards.shard_ids:
+            return
+        try:
+            purged = dead = 0
+            if self.history_days:
+                before = int(time.time()) - self.history_days * 86400
+                purged = await self.db.purge_history(before)
+                dead = await self.db.purge_dead(before)
+            freed = await self.db.vacuum()
+            logger.info("Database maintenance: purged %s history rows and %s failed or expired reminders, "
+                        "freed %s pages", purged, dead, freed)
+        except Exception as e:
+            logger.error("Error during database maintenance: %s", e)
+    
+    @tasks.loop(seconds=60)
+    async def update_metrics(self):
+        """Refresh the pending reminders gauge"""
+        try:
+            PENDING_REMINDERS.set(await self.db.count_live())
         except Exception as e:
-            logger.error(f"Error sending reminder {reminder_id}: {e}")
+            logger.error("Error counting reminders: %s", e)
+    
+    def _build_reminder_embed(self, reminder_id: int, message: str, reminder_time: int) -> discord.Embed:
+        """Build the embed a reminder is delivered as"""
+        embed = discord.Embed(
+            title="⏰ Reminder!",
+            description=message,
+            color=discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        if self.late_notice and time.time() - reminder_time >= self.late_notice:
+            embed.add_field(name="Delivered late", value=f"This was due <t:{reminder_time}:R>", inline=False)
+        embed.set_footer(text=f"Reminder ID: {reminder_id}")
+        return embed
+    
+    async def _send_reminder(self, reminder_id: int, user_ids: list, channel_id: int,
+                             embeds: list, delivery_type: str):
+        """Send one or more reminder embeds to their destination, raising if it was not delivered"""
+        if delivery_type == "dm":
+            # Send DM
+            user_id = user_ids[0]
+            channel = await self.resolver.dm_channel(user_id)
+            if channel is None:
+                if self.resolver.dms_closed(user_id):
+                    raise ReminderUndeliverable(f"Cannot send DM to user {user_id}")
+                raise ReminderUndeliverable(f"User {user_id} not found for reminder {reminder_id}")
+            try:
+                await channel.send(embeds=embeds)
+            except discord.Forbidden:
+                self.resolver.close_dms(user_id)
+                raise ReminderUndeliverable(f"Cannot send DM to user {user_id}")
+        
+        elif delivery_type == "server":
+            # Send in channel and ping users; a mention needs only the ID
+            channel = await self.resolver.channel(channel_id) if channel_id else None
+            if not channel:
+                raise ReminderUndeliverable(f"Channel {channel_id} not found for reminder {reminder_id}")
+            await channel.send(" ".join(f"<@{user_id}>" for user_id in user_ids), embeds=embeds)
     
     @check_reminders.before_loop
     async def before_check_reminders(self):
         """Wait until bot is ready before starting the reminder checker"""
         await self.bot.wait_until_ready()
+    
+    @elect_leader.before_loop
+    async def before_elect_leader(self):
+        """Only stand for election once connected and able to deliver"""
+        await self.bot.wait_until_ready()
+    
+    @drain_backlog.before_loop
+    async def before_drain_backlog(self):
+        """Wait until bot is ready before sending overdue reminders"""
+        await self.bot.wait_until_ready()
+
+class ReminderPages(discord.ui.View):
+    """Previous/next buttons for /reminders; each page is fetched when clicked"""
+    
+    def __init__(self, cog: ReminderSystem, user_id: int):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.user_id = user_id
+        self.page = 1
+        self.first_key = None
+        self.last_key = None
+        self.interaction = None
+    
+    def is_single_page(self) -> bool:
+        return self.previous_page.disabled and self.next_page.disabled
+    
+    async def load(self, after: tuple = None, before: tuple = None):
+        """Fetch the page next to a (reminder_time, id) key and return its embed, or None if empty"""
+        # One extra row tells whether there is a further page in that direction
+        rows = await self.cog.db.list_reminders(
+            self.user_id, PAGE_SIZE + 1, after=after, before=before
+        )
+        if before is not None:
+            has_previous, has_next = len(rows) > PAGE_SIZE, True
+            rows = rows[-PAGE_SIZE:]
+        else:
+            has_previous, has_next = after is not None, len(rows) > PAGE_SIZE
+            rows = rows[:PAGE_SIZE]
+        
+        if not rows:
+            if after is None and before is None:
+                return None
+            # The neighbouring page was deleted since it was linked; start over
+            self.page = 1
+            return await self.load()
+        
+        if not has_previous:
+            self.page = 1
+        self.first_key = (rows[0][3], rows[0][0])
+        self.last_key = (rows[-1][3], rows[-1][0])
+        self.previous_page.disabled = not has_previous
+        self.next_page.disabled = not has_next
+        return self.cog._build_reminders_embed(rows, self.page, not self.is_single_page())
+    
+    @discord.ui.button(label="Previous", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        await self._show(interaction, await self.load(before=self.first_key))
+    
+    @discord.ui.button(label="Next", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await self._show(interaction, await self.load(after=self.last_key))
+    
+    async def _show(self, interaction: discord.Interaction, embed):
+        self.interaction = interaction
+        if embed is None:
+            self.stop()
+            await interaction.response.edit_message(
+                content="📝 You have no active reminders.", embed=None, view=None
+            )
+            return
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    async def on_timeout(self):
+        """Remove the buttons once they stop working"""
+        if self.interaction is None:
+            return
+        try:
+            await self.interaction.edit_original_response(view=None)
+        except discord.HTTPException:
+            pass
 
 async def setup(bot: commands.Bot):
     """Setup function for the cog"""
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import math
+import os
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = registry.histogram(
+    'event_loop_lag_seconds', "How late the event loop wakes a sleeping task"
+)
+LOOP_LAG_LAST = registry.gauge('event_loop_lag_last_seconds', "Most recent event loop lag sample")
+
+# How long the lag probe sleeps between samples
+PROBE_INTERVAL = 0.5
+
+
+def format_seconds(value) -> str:
+    """Format a latency for display"""
+    if value is None or math.isnan(value):
+        return "n/a"
+    if value < 1:
+        return f"{value * 1000:.1f} ms"
+    return f"{value:.2f} s"
+
+
+class BotStats(commands.Cog):
+    """Runtime metrics: /stats and a local Prometheus-style endpoint"""
+    
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.metrics_host = os.getenv('METRICS_HOST', '127.0.0.1')
+        self.metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        self.server = None
+    
+    async def cog_load(self):
+        """Start the event loop probe and, if configured, the metrics endpoint"""
+        self.probe_loop_lag.start()
+        if self.metrics_port:
+            self.server = await asyncio.start_server(
+                self._serve_metrics, self.metrics_host, self.metrics_port
+            )
+            logger.info("Serving metrics on http://%s:%s/metrics", self.metrics_host, self.metrics_port)
+    
+    async def cog_unload(self):
+        """Stop the probe and the metrics endpoint"""
+        self.probe_loop_lag.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+    
+    @tasks.loop()
+    async def probe_loop_lag(self):
+        """Measure how late the loop wakes a task that asked to sleep"""
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lag = max(0.0, time.perf_counter() - started - PROBE_INTERVAL)
+        LOOP_LAG.observe(lag)
+        LOOP_LAG_LAST.set(lag)
+    
+    async def _serve_metrics(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one HTTP request with the metrics in text exposition format"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain the headers; the request body is never used
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass
+            
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == 'GET' and parts[1] in ('/', '/metrics'):
+                status, body = '200 OK', registry.render().encode()
+            else:
+                status, body = '404 Not Found', b'Not Found\n'
+            
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    @app_commands.command(name="stats", description="Show bot performance metrics (owner only)")
+    async def stats(self, interaction: discord.Interaction):
+        """Show dispatch lag, database latency and event loop health"""
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                "❌ Only the bot owner can use this command.",
+                ephemeral=True
+            )
+            return
+        
+        def quantile(name: str, q: float, **labels):
+            metric = registry.get(name)
+            return metric.quantile(q, **labels) if metric else None
+        
+        def value(name: str, **labels) -> int:
+            metric = registry.get(name)
+            return int(metric.value(**labels)) if metric else 0
+        
+        def throttled(reason: str) -> int:
+            return sum(value('reminder_throttled_total', command=command, reason=reason)
+                       for command in ('remind', 'reminder_edit', 'reminder_delete'))
+        
+        embed = discord.Embed(
+            title="📊 Bot Stats",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        
+        embed.add_field(
+            name="⏰ Reminders",
+            value=f"**Pending:** {value('reminder_pending')}\n"
+                  + "\n".join(
+                      f"**{delivery.upper()}:** "
+                      f"{value('reminder_deliveries_total', delivery=delivery, outcome='sent')} sent, "
+                      f"{value('reminder_deliveries_total', delivery=delivery, outcome='retried')} retried, "
+                      f"{value('reminder_deliveries_total', delivery=delivery, outcome='failed')} failed"
+                      for delivery in ('dm', 'server')
+                  )
+                  + f"\n**Throttled:** {throttled('rate')} rate limited, "
+                    f"{throttled('user_quota') + throttled('guild_quota')} over quota",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🚚 Dispatch (p50 / p99)",
+            value="\n".join(
+                f"**{delivery.upper()} lag:** "
+                f"{format_seconds(quantile('reminder_dispatch_lag_seconds', 0.5, delivery=delivery))} / "
+                f"{format_seconds(quantile('reminder_dispatch_lag_seconds', 0.99, delivery=delivery))}\n"
+                f"**{delivery.upper()} send:** "
+                f"{format_seconds(quantile('reminder_send_seconds', 0.5, delivery=delivery))} / "
+                f"{format_seconds(quantile('reminder_send_seconds', 0.99, delivery=delivery))}"
+                for delivery in ('dm', 'server')
+            ),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🗄️ Database (p50 / p99)",
+            value="\n".join(
+                f"**{query}:** {format_seconds(quantile('reminder_db_query_seconds', 0.5, query=query))} / "
+                f"{format_seconds(quantile('reminder_db_query_seconds', 0.99, query=query))}"
+                for query in ('insert', 'list', 'update', 'delete', 'claim_due', 'ack')
+            ),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="⚙️ Runtime",
+            value=f"**Event loop lag:** {format_seconds(LOOP_LAG_LAST.value())} now, "
+                  f"{format_seconds(LOOP_LAG.quantile(0.99))} p99\n"
+                  f"**Time parsing p99:** {format_seconds(quantile('reminder_parse_seconds', 0.99))}\n"
+                  f"**Gateway latency:** {format_seconds(self.bot.latency)}",
+            inline=False
+        )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    """Setup function for the cog"""
+    await bot.add_cog(BotStats(bot))
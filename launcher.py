@@ -0,0 +1,107 @@
+"""
+Run the bot as several worker processes, each owning a contiguous range of shards.
+
+Every worker runs main.py with SHARD_COUNT and SHARD_IDS set, connects only its
+own shards and dispatches only the reminders partitioned to them. All workers
+share reminders.db. Workers that exit are restarted after a short delay.
+
+Usage: python launcher.py --shards 8 --processes 4
+"""
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from utils.logsetup import setup_logging
+
+setup_logging(
+    level=os.getenv('LOG_LEVEL', 'INFO'),
+    json_output=os.getenv('LOG_FORMAT', 'text').lower() == 'json',
+    rate_limit=0
+)
+logger = logging.getLogger('launcher')
+
+# Discord allows one IDENTIFY per 5 seconds per bot (without large-bot concurrency)
+IDENTIFY_INTERVAL = 5.0
+
+
+def shard_ranges(shard_count: int, processes: int) -> list:
+    """Split shard IDs into contiguous, near-equal ranges, one per process"""
+    ranges = []
+    start = 0
+    for index in range(processes):
+        size = shard_count // processes + (1 if index < shard_count % processes else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return [shard_ids for shard_ids in ranges if shard_ids]
+
+
+def spawn(shard_count: int, shard_ids: list, sync_commands: bool,
+          force_sync: bool = False) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        SHARD_COUNT=str(shard_count),
+        SHARD_IDS=','.join(map(str, shard_ids)),
+        SYNC_COMMANDS='1' if sync_commands else '0'
+    )
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    command = [sys.executable, script]
+    if sync_commands and force_sync:
+        command.append('--sync-commands')
+    return subprocess.Popen(command, env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--shards', type=int, required=True, help="total shard count")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--restart-delay', type=float, default=5.0,
+                        help="seconds before restarting a worker that exited")
+    parser.add_argument('--sync-commands', action='store_true',
+                        help="make the first worker sync slash commands even if unchanged")
+    args = parser.parse_args()
+
+    ranges = shard_ranges(args.shards, min(args.processes, args.shards))
+    workers = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for process in workers.values():
+            process.send_signal(signal.SIGINT)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index, shard_ids in enumerate(ranges):
+        if stopping:
+            break
+        workers[index] = spawn(args.shards, shard_ids, sync_commands=index == 0,
+                               force_sync=args.sync_commands)
+        logger.info("Started worker %s (pid %s) for shards %s", index, workers[index].pid, shard_ids)
+        # Stagger workers so their IDENTIFYs do not collide
+        time.sleep(IDENTIFY_INTERVAL * len(shard_ids))
+
+    while workers:
+        time.sleep(1)
+        for index, process in list(workers.items()):
+            code = process.poll()
+            if code is None:
+                continue
+            if stopping:
+                del workers[index]
+                continue
+            logger.warning("Worker %s exited with code %s; restarting in %ss", index, code, args.restart_delay)
+            time.sleep(args.restart_delay)
+            workers[index] = spawn(args.shards, ranges[index], sync_commands=index == 0)
+
+    logger.info("All workers stopped")
+
+
+if __name__ == '__main__':
+    main()
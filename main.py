@@ -1,47 +1,84 @@
+import argparse
 import asyncio
 import logging
 import os
 
-import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.commandsync import sync_if_changed
+from utils.gateway import client_options
+from utils.logsetup import setup_logging
+
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
+# Configure logging; records are written by a background thread so a slow
+# log pipe never blocks the event loop
+setup_logging(
+    level=os.getenv('LOG_LEVEL', 'INFO'),
+    json_output=os.getenv('LOG_FORMAT', 'text').lower() == 'json',
+    rate_limit=int(os.getenv('LOG_RATE_LIMIT', '10'))
 )
 logger = logging.getLogger(__name__)
 
-# Bot configuration
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
+# Bot configuration: 'lean' (default) caches no guild members and resolves
+# reminder recipients on demand, 'full' chunks and caches every member
+MEMBER_CACHE = os.getenv('MEMBER_CACHE', 'lean').lower()
 
-bot = commands.Bot(
-    command_prefix='!',
-    intents=intents,
-    help_command=None
-)
+# Cog extensions loaded at startup
+EXTENSIONS = [
+    'cogs.fun',
+    'cogs.reminders',
+    'cogs.stats'
+]
+
+# Sharding: SHARD_COUNT total shards, of which this process runs SHARD_IDS
+# (comma-separated, default all). launcher.py sets both for each worker.
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0')) or None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('SHARD_IDS', '').split(',') if shard_id.strip()] or None
+
+# Fingerprint of the last synced command tree; commands are only re-synced when it changes
+COMMAND_SYNC_STATE = os.getenv('COMMAND_SYNC_STATE', '.command_sync')
+
+# Set by --sync-commands to upload the command tree even if it looks unchanged
+force_sync = False
+commands_checked = False
+
+if SHARD_COUNT or SHARD_IDS:
+    bot = commands.AutoShardedBot(
+        command_prefix='!',
+        help_command=None,
+        shard_count=SHARD_COUNT,
+        shard_ids=SHARD_IDS,
+        **client_options(MEMBER_CACHE)
+    )
+else:
+    bot = commands.Bot(
+        command_prefix='!',
+        help_command=None,
+        **client_options(MEMBER_CACHE)
+    )
 
 @bot.event
 async def on_ready():
     """Event triggered when bot is ready"""
-    logger.info(f'{bot.user} has connected to Discord!')
-    logger.info(f'Bot is in {len(bot.guilds)} guilds')
+    logger.info('%s has connected to Discord!', bot.user)
+    logger.info('Bot is in %s guilds', len(bot.guilds))
+    
+    # Commands are global, so only one process of a sharded deployment syncs them
+    global commands_checked
+    if os.getenv('SYNC_COMMANDS', '1') != '1' or commands_checked:
+        return
     
-    # Sync slash commands
+    # Sync slash commands once per process, and only if they changed
     try:
-        synced = await bot.tree.sync()
-        logger.info(f"Synced {len(synced)} command(s)")
+        synced = await sync_if_changed(bot.tree, COMMAND_SYNC_STATE, force=force_sync)
+        commands_checked = True
+        if synced is not None:
+            logger.info("Synced %s command(s)", len(synced))
     except Exception as e:
-        logger.error(f"Failed to sync commands: {e}")
+        logger.error("Failed to sync commands: %s", e)
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -51,22 +88,17 @@ async def on_command_error(ctx, error):
     elif isinstance(error, commands.MissingPermissions):
         await ctx.send("You don't have permission to use this command!")
     else:
-        logger.error(f"Command error: {error}")
+        logger.error("Command error: %s", error)
         await ctx.send(f"An error occurred: {error}")
 
 async def load_extensions():
     """Load all cog extensions"""
-    extensions = [
-        'cogs.fun',
-        'cogs.reminders'
-    ]
-    
-    for extension in extensions:
+    for extension in EXTENSIONS:
         try:
             await bot.load_extension(extension)
-            logger.info(f"Loaded extension: {extension}")
+            logger.info("Loaded extension: %s", extension)
         except Exception as e:
-            logger.error(f"Failed to load extension {extension}: {e}")
+            logger.error("Failed to load extension %s: %s", extension, e)
 
 async def main():
     """Main function to start the bot"""
@@ -75,9 +107,14 @@ async def main():
         await bot.start(os.getenv('DISCORD_TOKEN'))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Discord reminder bot")
+    parser.add_argument('--sync-commands', action='store_true',
+                        help="sync slash commands even if they look unchanged")
+    force_sync = parser.parse_args().sync_commands
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Bot crashed: {e}")
+        logger.error("Bot crashed: %s", e)
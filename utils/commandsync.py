@@ -0,0 +1,55 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from discord import app_commands
+
+logger = logging.getLogger(__name__)
+
+
+def tree_fingerprint(tree: app_commands.CommandTree) -> str:
+    """Hash the global command payload that CommandTree.sync() would upload"""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get('type', 1), command['name'])
+    )
+    data = json.dumps(
+        {'application_id': tree.client.application_id, 'commands': payload},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def read_fingerprint(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding='utf-8') as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_fingerprint(path: str, fingerprint: str):
+    # Write then rename so a crash never leaves a truncated fingerprint behind
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(fingerprint + '\n')
+    os.replace(temporary, path)
+
+
+async def sync_if_changed(tree: app_commands.CommandTree, path: str, force: bool = False) -> Optional[list]:
+    """
+    Sync global commands only if they changed since the last successful sync.
+
+    The fingerprint of the synced tree is stored at path. Returns the synced
+    commands, or None when the sync was skipped.
+    """
+    fingerprint = tree_fingerprint(tree)
+    if not force and read_fingerprint(path) == fingerprint:
+        logger.info("Slash commands unchanged since last sync, skipping")
+        return None
+
+    synced = await tree.sync()
+    write_fingerprint(path, fingerprint)
+    return synced
@@ -0,0 +1,705 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from utils.metrics import registry
+from utils.sharding import ShardFilter
+
+logger = logging.getLogger(__name__)
+
+# Values of PRAGMA synchronous. FULL fsyncs the WAL on every commit, so a
+# committed write survives power loss; NORMAL only fsyncs at checkpoints.
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+DB_LATENCY = registry.histogram(
+    'reminder_db_query_seconds', "Reminder database call latency, including queueing", ['query']
+)
+
+# Delivery states. Pending and claimed rows are live; a claimed row's
+# attempt_at is its lease expiry, after which it is due again. Sent reminders
+# are deleted when acknowledged, failed ones are kept for the user to see, as
+# are expired ones, which were too overdue to send when the bot came back.
+STATUS_PENDING = 'pending'
+STATUS_CLAIMED = 'claimed'
+STATUS_FAILED = 'failed'
+STATUS_EXPIRED = 'expired'
+
+# Times are stored as integer UTC epoch seconds. Statements are kept as
+# constants so sqlite3's per-connection statement cache always sees identical
+# SQL text and reuses the prepared statement.
+INSERT_REMINDER = '''
+    INSERT INTO reminders (user_id, channel_id, message, delivery_type, reminder_time, attempt_at,
+                           guild_id, recurrence)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# A user's reminders are paged by the (reminder_time, id) key, which
+# idx_reminders_user_time covers, so each page costs one index seek however
+# many reminders the user has.
+SELECT_USER_REMINDERS = '''
+    SELECT id, message, delivery_type, reminder_time, created_at, status, recurrence
+    FROM reminders
+    WHERE user_id = ?
+    ORDER BY reminder_time ASC, id ASC
+    LIMIT ?
+'''
+
+SELECT_USER_REMINDERS_AFTER = '''
+    SELECT id, message, delivery_type, reminder_time, created_at, status, recurrence
+    FROM reminders
+    WHERE user_id = ? AND (reminder_time, id) > (?, ?)
+    ORDER BY reminder_time ASC, id ASC
+    LIMIT ?
+'''
+
+SELECT_USER_REMINDERS_BEFORE = '''
+    SELECT id, message, delivery_type, reminder_time, created_at, status, recurrence
+    FROM reminders
+    WHERE user_id = ? AND (reminder_time, id) < (?, ?)
+    ORDER BY reminder_time DESC, id DESC
+    LIMIT ?
+'''
+
+UPDATE_REMINDER = '''
+    UPDATE reminders
+    SET message = ?, delivery_type = ?, reminder_time = ?, attempt_at = ?, channel_id = ?,
+        guild_id = ?, recurrence = NULLIF(COALESCE(?, recurrence), ''),
+        status = 'pending', attempts = 0
+    WHERE id = ? AND user_id = ?
+'''
+
+SELECT_REMINDER_STATE = '''
+    SELECT guild_id, status FROM reminders
+    WHERE id = ? AND user_id = ?
+'''
+
+DELETE_USER_REMINDER = '''
+    DELETE FROM reminders
+    WHERE id = ? AND user_id = ?
+'''
+
+# The status term must match idx_reminders_due's WHERE clause verbatim for
+# SQLite to use the partial index. owns_reminder() is registered per
+# connection and filters out reminders that belong to another shard process.
+SELECT_DUE = '''
+    SELECT id, user_id, channel_id, message, delivery_type, reminder_time, attempts, recurrence
+    FROM reminders
+    WHERE status IN ('pending', 'claimed') AND attempt_at BETWEEN ? AND ?
+      AND owns_reminder(guild_id, user_id)
+    ORDER BY attempt_at
+    LIMIT ?
+'''
+
+CLAIM_REMINDER = '''
+    UPDATE reminders
+    SET status = 'claimed', attempt_at = ?, attempts = attempts + 1
+    WHERE id = ?
+'''
+
+ACK_SENT = "DELETE FROM reminders WHERE id = ? AND status = 'claimed'"
+
+# Delivered reminders (and each delivered occurrence of a recurring one) are
+# copied here before being deleted or rescheduled, so the live table only
+# holds reminders that can still fire.
+ARCHIVE_REMINDER = '''
+    INSERT INTO reminder_history (reminder_id, user_id, guild_id, message, delivery_type,
+                                  reminder_time, delivered_at)
+    SELECT id, user_id, guild_id, message, delivery_type, reminder_time, ?
+    FROM reminders
+    WHERE id = ? AND status = 'claimed'
+'''
+
+ACK_RETRY = '''
+    UPDATE reminders
+    SET status = 'pending', attempt_at = ?
+    WHERE id = ? AND status = 'claimed'
+'''
+
+# A delivered recurring reminder becomes pending again at its next occurrence
+ACK_RESCHEDULE = '''
+    UPDATE reminders
+    SET status = 'pending', reminder_time = ?, attempt_at = ?, attempts = 0
+    WHERE id = ? AND status = 'claimed'
+'''
+
+ACK_FAILED = '''
+    UPDATE reminders
+    SET status = 'failed'
+    WHERE id = ? AND status = 'claimed'
+'''
+
+ACK_EXPIRED = '''
+    UPDATE reminders
+    SET status = 'expired'
+    WHERE id = ? AND status = 'claimed'
+'''
+
+COUNT_LIVE = "SELECT COUNT(*) FROM reminders WHERE status IN ('pending', 'claimed')"
+
+# Per-owner counts for quotas; each seeks its own index instead of scanning the table
+COUNT_USER_LIVE = '''
+    SELECT COUNT(*) FROM reminders
+    WHERE user_id = ? AND status IN ('pending', 'claimed')
+'''
+
+COUNT_GUILD_LIVE = '''
+    SELECT COUNT(*) FROM reminders
+    WHERE guild_id = ? AND status IN ('pending', 'claimed')
+'''
+
+SELECT_USER_HISTORY = '''
+    SELECT reminder_id, message, delivery_type, reminder_time, delivered_at
+    FROM reminder_history
+    WHERE user_id = ?
+    ORDER BY delivered_at DESC, id DESC
+    LIMIT ?
+'''
+
+# History ids grow with delivered_at, so the oldest rows sit at the start of
+# the table and a rowid-ordered scan finds a purge batch without an index.
+PURGE_HISTORY = '''
+    DELETE FROM reminder_history
+    WHERE id IN (
+        SELECT id FROM reminder_history WHERE delivered_at < ? ORDER BY id LIMIT ?
+    )
+'''
+
+# Failed and expired reminders never fire again; they stay listed in /reminders
+# until the history retention has passed since they were due
+PURGE_DEAD = '''
+    DELETE FROM reminders
+    WHERE id IN (
+        SELECT id FROM reminders
+        WHERE status IN ('failed', 'expired') AND reminder_time < ?
+        LIMIT ?
+    )
+'''
+
+# A lease is taken over only by its holder (renewal) or once it has lapsed
+ACQUIRE_LEASE = '''
+    INSERT INTO leader_lease (name, holder, expires_at) VALUES (?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+    WHERE leader_lease.holder = excluded.holder OR leader_lease.expires_at <= ?
+'''
+
+RELEASE_LEASE = 'DELETE FROM leader_lease WHERE name = ? AND holder = ?'
+
+SELECT_SCHEDULE = '''
+    SELECT id, attempt_at
+    FROM reminders
+    WHERE status IN ('pending', 'claimed') AND attempt_at BETWEEN ? AND ?
+      AND owns_reminder(guild_id, user_id)
+'''
+
+
+def _iso_to_epoch(value: str) -> int:
+    """Convert a legacy naive local ISO timestamp to UTC epoch seconds"""
+    return int(round(datetime.fromisoformat(value).timestamp()))
+
+
+def _migrate_epoch_schema(conn: sqlite3.Connection):
+    """Version 1: integer epoch times and indexes on reminder_time"""
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reminders'"
+    ).fetchone()
+    if legacy:
+        conn.execute('ALTER TABLE reminders RENAME TO reminders_legacy')
+    conn.execute('''
+        CREATE TABLE reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            channel_id INTEGER,
+            message TEXT NOT NULL,
+            delivery_type TEXT NOT NULL,
+            reminder_time INTEGER NOT NULL,
+            created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )
+    ''')
+    if legacy:
+        conn.create_function('iso_to_epoch', 1, _iso_to_epoch, deterministic=True)
+        conn.execute('''
+            INSERT INTO reminders (id, user_id, channel_id, message, delivery_type,
+                                   reminder_time, created_at)
+            SELECT id, user_id, channel_id, message, delivery_type,
+                   iso_to_epoch(reminder_time),
+                   COALESCE(CAST(strftime('%s', created_at) AS INTEGER),
+                            CAST(strftime('%s', 'now') AS INTEGER))
+            FROM reminders_legacy
+        ''')
+        # Carry the AUTOINCREMENT counter over so deleted IDs are never reused
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'reminders'")
+        conn.execute(
+            "UPDATE sqlite_sequence SET name = 'reminders' WHERE name = 'reminders_legacy'"
+        )
+        conn.execute('DROP TABLE reminders_legacy')
+    # The due-scan and scheduler refill range-scan reminder_time; per-user
+    # listings seek on user_id and read rows already ordered by reminder_time.
+    conn.execute('CREATE INDEX idx_reminders_time ON reminders (reminder_time)')
+    conn.execute('CREATE INDEX idx_reminders_user_time ON reminders (user_id, reminder_time)')
+
+
+def _migrate_delivery_states(conn: sqlite3.Connection):
+    """Version 2: claim/ack delivery states with retry bookkeeping"""
+    conn.execute("ALTER TABLE reminders ADD COLUMN status TEXT NOT NULL DEFAULT 'pending'")
+    conn.execute('ALTER TABLE reminders ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0')
+    conn.execute('ALTER TABLE reminders ADD COLUMN attempt_at INTEGER')
+    conn.execute('UPDATE reminders SET attempt_at = reminder_time')
+    # Only live rows are indexed for the due-scan, so failed rows cost nothing
+    conn.execute('DROP INDEX idx_reminders_time')
+    conn.execute('''
+        CREATE INDEX idx_reminders_due ON reminders (attempt_at)
+        WHERE status IN ('pending', 'claimed')
+    ''')
+
+
+def _migrate_guild_partition(conn: sqlite3.Connection):
+    """Version 3: record the guild of server reminders for shard partitioning"""
+    conn.execute('ALTER TABLE reminders ADD COLUMN guild_id INTEGER')
+
+
+def _migrate_recurrence(conn: sqlite3.Connection):
+    """Version 4: repeat rules for recurring reminders"""
+    conn.execute('ALTER TABLE reminders ADD COLUMN recurrence TEXT')
+
+
+def _migrate_history(conn: sqlite3.Connection):
+    """Version 5: history of delivered reminders, kept out of the live table"""
+    conn.execute('''
+        CREATE TABLE reminder_history (
+            id INTEGER PRIMARY KEY,
+            reminder_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER,
+            message TEXT NOT NULL,
+            delivery_type TEXT NOT NULL,
+            reminder_time INTEGER NOT NULL,
+            delivered_at INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_history_user ON reminder_history (user_id, delivered_at)')
+
+
+def _migrate_leader_lease(conn: sqlite3.Connection):
+    """Version 6: leases for electing which replica dispatches reminders"""
+    conn.execute('''
+        CREATE TABLE leader_lease (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+
+
+def _migrate_guild_index(conn: sqlite3.Connection):
+    """Version 7: index server reminders by guild for per-guild quotas"""
+    conn.execute('CREATE INDEX idx_reminders_guild ON reminders (guild_id) WHERE guild_id IS NOT NULL')
+
+
+def _migrate_dead_index(conn: sqlite3.Connection):
+    """Version 8: index failed and expired reminders for the retention purge"""
+    conn.execute('''
+        CREATE INDEX idx_reminders_dead ON reminders (reminder_time)
+        WHERE status IN ('failed', 'expired')
+    ''')
+
+
+# Schema migrations, applied in order; PRAGMA user_version records how many ran
+MIGRATIONS = (
+    _migrate_epoch_schema,
+    _migrate_delivery_states,
+    _migrate_guild_partition,
+    _migrate_recurrence,
+    _migrate_history,
+    _migrate_leader_lease,
+    _migrate_guild_index,
+    _migrate_dead_index,
+)
+
+
+def migrate(conn: sqlite3.Connection):
+    """
+    Bring a database up to the latest schema version in place.
+
+    The version is read again after taking the write lock for each step, so
+    processes opening the same database at once (shard workers, replicas)
+    each apply a migration only if no other process already has.
+    """
+    while True:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.execute('COMMIT')
+                return
+            MIGRATIONS[version](conn)
+            conn.execute(f'PRAGMA user_version = {version + 1}')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        logger.info("Migrated reminders database to schema version %s", version + 1)
+
+
+class ReminderDatabase:
+    """
+    Reminder storage on a single long-lived SQLite connection.
+
+    Every query runs on one dedicated worker thread so the event loop never
+    blocks on disk I/O, and the connection is opened once in WAL mode so
+    readers and the writer do not wait on each other.
+
+    Inserts, edits and deletes are group-committed: writes that arrive while
+    a batch is committing (plus, optionally, for write_delay seconds) are
+    committed together in one transaction of at most write_batch statements.
+    Each caller still gets its own result, only once the batch is committed.
+    With the default synchronous=FULL that commit is fsynced, so a write is
+    durable once acknowledged and one fsync is shared by the whole batch.
+    """
+
+    def __init__(self, path: str, shards: Optional[ShardFilter] = None,
+                 write_delay: float = 0.0, write_batch: int = 256, synchronous: str = 'FULL'):
+        if synchronous.upper() not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode {synchronous!r}, expected one of: "
+                             f"{', '.join(SYNCHRONOUS_MODES)}")
+        self.path = path
+        self.synchronous = synchronous.upper()
+        self.shards = shards or ShardFilter()
+        self.write_delay = write_delay
+        self.write_batch = write_batch
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reminders-db')
+        self._writes: List[Tuple] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def _run(self, query: str, func, *args):
+        """Run a blocking function on the database thread, recording its latency"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            DB_LATENCY.observe(time.perf_counter() - started, query=query)
+
+    async def open(self):
+        """Open the connection and create the schema"""
+        await self._run('open', self._open)
+
+    async def close(self):
+        """Commit queued writes, close the connection and stop the worker thread"""
+        if self._flusher is not None:
+            await asyncio.shield(self._flusher)
+        await self._run('close', self._close)
+        self._executor.shutdown(wait=False)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, cached_statements=64)
+        # Takes effect only on a new, empty file, which then needs no VACUUM to
+        # convert; existing files are converted by the first vacuum() instead
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.create_function('owns_reminder', 2, self._owns_reminder, deterministic=True)
+        migrate(conn)
+        self._conn = conn
+
+    def _owns_reminder(self, guild_id: Optional[int], user_id: int) -> int:
+        return 1 if self.shards.owns_all or self.shards.owns(guild_id, user_id) else 0
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def insert_reminder(self, user_id: int, channel_id: Optional[int], message: str,
+                              delivery_type: str, reminder_time: int,
+                              guild_id: Optional[int] = None, recurrence: Optional[str] = None) -> int:
+        """Insert a pending reminder and return its ID"""
+        return await self._queue_write('insert', INSERT_REMINDER, (
+            user_id, channel_id, message, delivery_type, reminder_time, reminder_time, guild_id,
+            recurrence
+        ))
+
+    async def list_reminders(self, user_id: int, limit: int,
+                             after: Optional[Tuple[int, int]] = None,
+                             before: Optional[Tuple[int, int]] = None) -> List[Tuple]:
+        """
+        Return one page of a user's pending, in-flight and failed reminders by due time.
+
+        `after` and `before` are (reminder_time, id) keys of the neighbouring page's
+        last and first rows. Rows are always returned in ascending order.
+        """
+        if after is not None:
+            return await self._run('list', self._fetchall, SELECT_USER_REMINDERS_AFTER,
+                                   (user_id, *after, limit))
+        if before is not None:
+            rows = await self._run('list', self._fetchall, SELECT_USER_REMINDERS_BEFORE,
+                                   (user_id, *before, limit))
+            return rows[::-1]
+        return await self._run('list', self._fetchall, SELECT_USER_REMINDERS, (user_id, limit))
+
+    async def update_reminder(self, reminder_id: int, user_id: int, message: str,
+                              delivery_type: str, reminder_time: int,
+                              channel_id: Optional[int], guild_id: Optional[int] = None,
+                              recurrence: Optional[str] = None) -> int:
+        """
+        Update a user's reminder and return the number of rows changed.
+
+        A recurrence of None keeps the reminder's repeat rule and '' removes it.
+        """
+        return await self._queue_write('update', UPDATE_REMINDER, (
+            message, delivery_type, reminder_time, reminder_time, channel_id, guild_id, recurrence,
+            reminder_id, user_id
+        ))
+
+    async def delete_reminder(self, reminder_id: int, user_id: int) -> int:
+        """Delete a user's reminder and return the number of rows changed"""
+        return await self._queue_write('delete', DELETE_USER_REMINDER, (reminder_id, user_id))
+
+    async def reminder_state(self, reminder_id: int, user_id: int) -> Optional[Tuple]:
+        """Return (guild_id, status) for a user's reminder, or None if they have no such reminder"""
+        rows = await self._run('state', self._fetchall, SELECT_REMINDER_STATE, (reminder_id, user_id))
+        return rows[0] if rows else None
+
+    async def _queue_write(self, query: str, sql: str, params: tuple) -> int:
+        """Queue a write for the next group commit and wait until it is committed"""
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._writes.append((query, sql, params, future))
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_writes())
+        try:
+            return await future
+        finally:
+            DB_LATENCY.observe(time.perf_counter() - started, query=query)
+
+    async def _flush_writes(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._writes:
+                if self.write_delay:
+                    await asyncio.sleep(self.write_delay)
+                batch = self._writes[:self.write_batch]
+                del self._writes[:self.write_batch]
+                try:
+                    results = await loop.run_in_executor(
+                        self._executor, self._commit_writes,
+                        [(query, sql, params) for query, sql, params, _ in batch]
+                    )
+                except Exception as e:
+                    results = [e] * len(batch)
+                for (*_, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            self._flusher = None
+
+    def _commit_writes(self, batch: list) -> list:
+        """Run a batch of writes in one transaction, returning each one's result or error"""
+        results = []
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            for query, sql, params in batch:
+                try:
+                    cursor = self._conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    # A failed statement is undone on its own unless SQLite had
+                    # to abandon the whole transaction
+                    if not self._conn.in_transaction:
+                        raise
+                    results.append(e)
+                    continue
+                results.append(cursor.lastrowid if query == 'insert' else cursor.rowcount)
+            self._conn.execute('COMMIT')
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute('ROLLBACK')
+            raise
+        return results
+
+    async def claim_due(self, now: float, lease_until: int, limit: int,
+                        since: float = 0) -> List[Tuple]:
+        """
+        Claim up to limit reminders due between since and now in one transaction.
+
+        Claimed rows stay claimed until acknowledged or until lease_until, after
+        which they are due again, so a crash mid-delivery never loses a reminder.
+        """
+        return await self._run('claim_due', self._claim_due, now, lease_until, limit, since)
+
+    def _claim_due(self, now: float, lease_until: int, limit: int, since: float) -> List[Tuple]:
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self._conn.execute(SELECT_DUE, (since, now, limit)).fetchall()
+            self._conn.executemany(CLAIM_REMINDER, [(lease_until, row[0]) for row in rows])
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return rows
+
+    async def ack(self, sent: Iterable[int] = (), retry: Iterable[Tuple[int, int]] = (),
+                  failed: Iterable[int] = (), rescheduled: Iterable[Tuple[int, int]] = (),
+                  expired: Iterable[int] = (), skipped: Iterable[Tuple[int, int]] = ()):
+        """
+        Record the outcome of a batch of claimed reminders in one transaction.
+
+        Sent reminders are moved to the history table, except recurring ones,
+        which are passed in rescheduled as (id, next occurrence) and become
+        pending again after their delivered occurrence is recorded there.
+        Recurring reminders in skipped move on without a history entry.
+        """
+        rescheduled = list(rescheduled)
+        delivered_at = int(time.time())
+        await self._run('ack', self._ack,
+                        [(delivered_at, reminder_id)
+                         for reminder_id in (*sent, *(reminder_id for reminder_id, _ in rescheduled))],
+                        [(reminder_id,) for reminder_id in sent],
+                        [(attempt_at, reminder_id) for reminder_id, attempt_at in retry],
+                        [(reminder_id,) for reminder_id in failed],
+                        [(due, due, reminder_id) for reminder_id, due in (*rescheduled, *skipped)],
+                        [(reminder_id,) for reminder_id in expired])
+
+    def _ack(self, delivered: list, sent: list, retry: list, failed: list, rescheduled: list,
+             expired: list):
+        with self._conn:
+            self._conn.executemany(ARCHIVE_REMINDER, delivered)
+            self._conn.executemany(ACK_SENT, sent)
+            self._conn.executemany(ACK_RETRY, retry)
+            self._conn.executemany(ACK_FAILED, failed)
+            self._conn.executemany(ACK_RESCHEDULE, rescheduled)
+            self._conn.executemany(ACK_EXPIRED, expired)
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        """
+        Take or renew the named lease for ttl seconds and return whether holder has it.
+
+        Replicas sharing the database call this periodically; the lease only
+        changes hands once its holder has stopped renewing it and it lapsed.
+        """
+        return await self._run('lease', self._acquire_lease, name, holder, ttl)
+
+    def _acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        now = time.time()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            acquired = self._conn.execute(ACQUIRE_LEASE, (name, holder, now + ttl, now)).rowcount > 0
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return acquired
+
+    async def release_lease(self, name: str, holder: str):
+        """Give up the named lease if holder has it, so a standby can take over at once"""
+        await self._run('lease', self._execute_write, RELEASE_LEASE, (name, holder))
+
+    async def fetch_schedule(self, before: float, since: float = 0) -> List[Tuple]:
+        """Return (id, attempt_at) for live reminders due between since and before"""
+        return await self._run('schedule', self._fetchall, SELECT_SCHEDULE, (since, before))
+
+    async def count_live(self) -> int:
+        """Return the number of pending and in-flight reminders"""
+        rows = await self._run('count', self._fetchall, COUNT_LIVE, ())
+        return rows[0][0]
+
+    async def count_user_live(self, user_id: int) -> int:
+        """Return the number of a user's pending and in-flight reminders"""
+        rows = await self._run('count_user', self._fetchall, COUNT_USER_LIVE, (user_id,))
+        return rows[0][0]
+
+    async def count_guild_live(self, guild_id: int) -> int:
+        """Return the number of pending and in-flight reminders for a server"""
+        rows = await self._run('count_guild', self._fetchall, COUNT_GUILD_LIVE, (guild_id,))
+        return rows[0][0]
+
+    async def list_history(self, user_id: int, limit: int) -> List[Tuple]:
+        """Return a user's most recently delivered reminders, newest first"""
+        return await self._run('history', self._fetchall, SELECT_USER_HISTORY, (user_id, limit))
+
+    async def purge_history(self, before: int, batch: int = 500, pause: float = 0.05) -> int:
+        """
+        Delete history delivered before the given time and return how many rows went.
+
+        Rows are deleted batch at a time, each in its own short transaction with
+        a pause in between, so deliveries and commands are never held up for long.
+        """
+        return await self._purge('purge', PURGE_HISTORY, before, batch, pause)
+
+    async def purge_dead(self, before: int, batch: int = 500, pause: float = 0.05) -> int:
+        """Delete failed and expired reminders due before the given time and return how many went"""
+        return await self._purge('purge_dead', PURGE_DEAD, before, batch, pause)
+
+    async def _purge(self, query: str, sql: str, before: int, batch: int, pause: float) -> int:
+        """Run a batched DELETE until it removes fewer than batch rows and return the total"""
+        purged = 0
+        while True:
+            deleted = await self._run(query, self._execute_write, sql, (before, batch))
+            purged += deleted
+            if deleted < batch:
+                return purged
+            await asyncio.sleep(pause)
+
+    async def vacuum(self, pages: int = 1000, pause: float = 0.05) -> int:
+        """
+        Return free pages to the file system and return how many were freed.
+
+        Runs incremental vacuum steps of at most pages pages, then truncates
+        the WAL, so the file shrinks back after purges and heavy churn. A file
+        created before incremental auto-vacuum is first converted with one full
+        VACUUM, which holds the database for its duration; maintenance runs
+        off-peak so that happens at a quiet hour rather than at startup.
+        """
+        freed = await self._run('vacuum', self._enable_incremental_vacuum)
+        while True:
+            before, after = await self._run('vacuum', self._incremental_vacuum, pages)
+            freed += before - after
+            if after == 0 or before == after:
+                break
+            await asyncio.sleep(pause)
+        await self._run('vacuum', self._fetchall, 'PRAGMA wal_checkpoint(TRUNCATE)', ())
+        return freed
+
+    def _enable_incremental_vacuum(self) -> int:
+        """Switch an older file to incremental auto-vacuum and return the pages the VACUUM freed"""
+        # Read the mode under the write lock so a VACUUM another process is
+        # running finishes first and is not repeated here
+        self._conn.execute('BEGIN IMMEDIATE')
+        mode = self._conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        free = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+        self._conn.execute('COMMIT')
+        if mode == 2:
+            return 0
+        started = time.perf_counter()
+        self._conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        try:
+            self._conn.execute('VACUUM')
+        except sqlite3.OperationalError:
+            # Lost a race with another process converting the same file
+            if self._conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                raise
+            return 0
+        logger.info("Enabled incremental vacuum in %.2fs", time.perf_counter() - started)
+        return free
+
+    def _incremental_vacuum(self, pages: int) -> Tuple[int, int]:
+        before = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+        # execute() stops after the first freed page; executescript() runs the pragma to completion
+        self._conn.executescript(f'PRAGMA incremental_vacuum({int(pages)})')
+        return before, self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+    def _execute_write(self, sql: str, params: tuple) -> int:
+        with self._conn:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetchall(self, sql: str, params: tuple) -> List[Tuple]:
+        return self._conn.execute(sql, params).fetchall()
+
@@ -0,0 +1,60 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class ReminderDispatcher:
+    """
+    Sends due reminders concurrently while keeping each destination in order.
+
+    Every route (one user's DMs, or one channel) gets its own queue drained by
+    a single worker, so at most one request is in flight per Discord message
+    rate-limit bucket and discord.py's HTTP client never has to queue behind
+    itself. A semaphore bounds how many routes send at once, so throughput
+    scales with the number of distinct destinations up to ``concurrency``.
+    """
+
+    def __init__(self, concurrency: int = 16):
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._queues: dict = {}
+        self._workers: dict = {}
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, route: Hashable, func: Callable[..., Awaitable[Any]], *args) -> asyncio.Future:
+        """Queue func(*args) on a route and return a future for its result"""
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(route, deque())
+        queue.append((func, args, future))
+        if route not in self._workers:
+            self._workers[route] = asyncio.create_task(self._drain(route, queue))
+        return future
+
+    async def _drain(self, route: Hashable, queue: deque):
+        try:
+            while queue:
+                func, args, future = queue.popleft()
+                async with self._semaphore:
+                    try:
+                        result = await func(*args)
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+        finally:
+            del self._queues[route]
+            del self._workers[route]
+
+    async def close(self):
+        """Cancel every queued and in-flight send"""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        for queue in list(self._queues.values()):
+            for _, _, future in queue:
+                future.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
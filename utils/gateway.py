@@ -0,0 +1,30 @@
+import discord
+
+# Values of MEMBER_CACHE
+MEMBER_CACHE_MODES = ('lean', 'full')
+
+
+def client_options(member_cache: str = 'lean') -> dict:
+    """
+    Return the intents and cache settings the bot is created with.
+
+    'lean' keeps no guild members in memory: the privileged members intent is
+    off, guilds are not chunked on connect and MemberCacheFlags.none() drops
+    the members (and voice members) guild payloads carry, so memory does not
+    grow with total guild membership. Reminder recipients are looked up at
+    send time through DiscordResolver's bounded cache instead. 'full' is
+    discord.py's default: every member of every guild is chunked and cached.
+    """
+    intents = discord.Intents.default()
+    intents.message_content = True
+    if member_cache == 'full':
+        intents.members = True
+        return {'intents': intents}
+    if member_cache == 'lean':
+        intents.members = False
+        return {
+            'intents': intents,
+            'member_cache_flags': discord.MemberCacheFlags.none(),
+            'chunk_guilds_at_startup': False,
+        }
+    raise ValueError(f"Unknown member cache {member_cache!r}, expected one of: {', '.join(MEMBER_CACHE_MODES)}")
@@ -0,0 +1,308 @@
+import asyncio
+import itertools
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.database import STATUS_CLAIMED, STATUS_EXPIRED, STATUS_FAILED, STATUS_PENDING
+from utils.sharding import ShardFilter
+
+logger = logging.getLogger(__name__)
+
+
+class _Reminder:
+    __slots__ = ('id', 'user_id', 'channel_id', 'guild_id', 'message', 'delivery_type',
+                 'reminder_time', 'attempt_at', 'attempts', 'status', 'recurrence', 'created_at')
+
+    def __init__(self, id: int, user_id: int, channel_id: Optional[int], guild_id: Optional[int],
+                 message: str, delivery_type: str, reminder_time: int,
+                 recurrence: Optional[str], created_at: int):
+        self.id = id
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.message = message
+        self.delivery_type = delivery_type
+        self.reminder_time = reminder_time
+        self.attempt_at = reminder_time
+        self.attempts = 0
+        self.status = STATUS_PENDING
+        self.recurrence = recurrence
+        self.created_at = created_at
+
+    @property
+    def live(self) -> bool:
+        return self.status in (STATUS_PENDING, STATUS_CLAIMED)
+
+
+class MemoryReminderStore:
+    """
+    Reminder storage in process memory, for tests and load tests.
+
+    Implements the same ReminderStore interface and row shapes as
+    ReminderDatabase. Reminders live in a dict by ID; per-user listings and
+    the due-scan use lists kept sorted by (reminder_time, id) and
+    (attempt_at, id), so they cost a binary search plus the rows returned,
+    like the SQLite indexes they stand in for. Live reminders per server are
+    counted as they are indexed. Nothing survives a restart.
+    """
+
+    def __init__(self, shards: Optional[ShardFilter] = None):
+        self.shards = shards or ShardFilter()
+        self._ids = itertools.count(1)
+        self._reminders: Dict[int, _Reminder] = {}
+        self._by_user: Dict[int, List[Tuple[int, int]]] = {}
+        self._due: List[Tuple[int, int]] = []
+        # Guild ID -> number of live reminders delivered in it
+        self._live_by_guild: Dict[int, int] = {}
+        # Per user, (delivered_at, reminder_id, message, delivery_type, reminder_time) oldest first
+        self._history: Dict[int, List[Tuple]] = {}
+        # Lease name -> (holder, expires_at)
+        self._leases: Dict[str, Tuple[str, float]] = {}
+
+    async def open(self):
+        logger.warning("Using in-memory reminder storage; reminders are lost when the bot stops")
+
+    async def close(self):
+        pass
+
+    def _owns(self, reminder: _Reminder) -> bool:
+        return self.shards.owns_all or self.shards.owns(reminder.guild_id, reminder.user_id)
+
+    def _index(self, reminder: _Reminder):
+        insort(self._by_user.setdefault(reminder.user_id, []), (reminder.reminder_time, reminder.id))
+        if reminder.live:
+            insort(self._due, (reminder.attempt_at, reminder.id))
+            if reminder.guild_id is not None:
+                self._live_by_guild[reminder.guild_id] = self._live_by_guild.get(reminder.guild_id, 0) + 1
+
+    def _unindex(self, reminder: _Reminder):
+        keys = self._by_user[reminder.user_id]
+        del keys[bisect_left(keys, (reminder.reminder_time, reminder.id))]
+        if not keys:
+            del self._by_user[reminder.user_id]
+        if reminder.live:
+            del self._due[bisect_left(self._due, (reminder.attempt_at, reminder.id))]
+            if reminder.guild_id is not None:
+                count = self._live_by_guild.pop(reminder.guild_id) - 1
+                if count:
+                    self._live_by_guild[reminder.guild_id] = count
+
+    async def insert_reminder(self, user_id: int, channel_id: Optional[int], message: str,
+                              delivery_type: str, reminder_time: int,
+                              guild_id: Optional[int] = None, recurrence: Optional[str] = None) -> int:
+        """Insert a pending reminder and return its ID"""
+        reminder = _Reminder(next(self._ids), user_id, channel_id, guild_id, message, delivery_type,
+                             reminder_time, recurrence, int(time.time()))
+        self._reminders[reminder.id] = reminder
+        self._index(reminder)
+        return reminder.id
+
+    async def list_reminders(self, user_id: int, limit: int,
+                             after: Optional[Tuple[int, int]] = None,
+                             before: Optional[Tuple[int, int]] = None) -> List[Tuple]:
+        """Return one page of a user's reminders by due time, as ReminderDatabase does"""
+        keys = self._by_user.get(user_id, [])
+        if after is not None:
+            start = bisect_right(keys, tuple(after))
+            page = keys[start:start + limit]
+        elif before is not None:
+            end = bisect_left(keys, tuple(before))
+            page = keys[max(0, end - limit):end]
+        else:
+            page = keys[:limit]
+        rows = []
+        for _, reminder_id in page:
+            reminder = self._reminders[reminder_id]
+            rows.append((reminder.id, reminder.message, reminder.delivery_type, reminder.reminder_time,
+                         reminder.created_at, reminder.status, reminder.recurrence))
+        return rows
+
+    async def update_reminder(self, reminder_id: int, user_id: int, message: str,
+                              delivery_type: str, reminder_time: int,
+                              channel_id: Optional[int], guild_id: Optional[int] = None,
+                              recurrence: Optional[str] = None) -> int:
+        """Update a user's reminder and return the number of reminders changed"""
+        reminder = self._reminders.get(reminder_id)
+        if reminder is None or reminder.user_id != user_id:
+            return 0
+        self._unindex(reminder)
+        reminder.message = message
+        reminder.delivery_type = delivery_type
+        reminder.reminder_time = reminder.attempt_at = reminder_time
+        reminder.channel_id = channel_id
+        reminder.guild_id = guild_id
+        if recurrence is not None:
+            reminder.recurrence = recurrence or None
+        reminder.status = STATUS_PENDING
+        reminder.attempts = 0
+        self._index(reminder)
+        return 1
+
+    async def delete_reminder(self, reminder_id: int, user_id: int) -> int:
+        """Delete a user's reminder and return the number of reminders changed"""
+        reminder = self._reminders.get(reminder_id)
+        if reminder is None or reminder.user_id != user_id:
+            return 0
+        self._unindex(reminder)
+        del self._reminders[reminder_id]
+        return 1
+
+    async def reminder_state(self, reminder_id: int, user_id: int) -> Optional[Tuple]:
+        """Return (guild_id, status) for a user's reminder, or None if they have no such reminder"""
+        reminder = self._reminders.get(reminder_id)
+        if reminder is None or reminder.user_id != user_id:
+            return None
+        return reminder.guild_id, reminder.status
+
+    async def claim_due(self, now: float, lease_until: int, limit: int,
+                        since: float = 0) -> List[Tuple]:
+        """Claim up to limit reminders due between since and now and return them"""
+        start = bisect_left(self._due, (since,))
+        end = bisect_right(self._due, (now, float('inf')))
+        claimed, kept = [], []
+        index = start
+        while index < end and len(claimed) < limit:
+            reminder = self._reminders[self._due[index][1]]
+            if self._owns(reminder):
+                claimed.append(reminder)
+            else:
+                kept.append(self._due[index])
+            index += 1
+        if not claimed:
+            return []
+
+        rows = []
+        for reminder in claimed:
+            rows.append((reminder.id, reminder.user_id, reminder.channel_id, reminder.message,
+                         reminder.delivery_type, reminder.reminder_time, reminder.attempts,
+                         reminder.recurrence))
+            reminder.status = STATUS_CLAIMED
+            reminder.attempt_at = lease_until
+            reminder.attempts += 1
+        # One splice to drop the claimed keys, and one to merge them back in at
+        # lease_until next to any claimed earlier with the same lease
+        self._due[start:index] = kept
+        low = bisect_left(self._due, (lease_until,))
+        high = bisect_right(self._due, (lease_until, float('inf')))
+        leased = sorted((lease_until, reminder.id) for reminder in claimed)
+        self._due[low:high] = merge(self._due[low:high], leased)
+        return rows
+
+    async def ack(self, sent: Iterable[int] = (), retry: Iterable[Tuple[int, int]] = (),
+                  failed: Iterable[int] = (), rescheduled: Iterable[Tuple[int, int]] = (),
+                  expired: Iterable[int] = (), skipped: Iterable[Tuple[int, int]] = ()):
+        """Record the outcome of a batch of claimed reminders, as ReminderDatabase does"""
+        delivered_at = int(time.time())
+
+        def claimed(reminder_id: int) -> Optional[_Reminder]:
+            reminder = self._reminders.get(reminder_id)
+            if reminder is None or reminder.status != STATUS_CLAIMED:
+                return None
+            return reminder
+
+        def archive(reminder: _Reminder):
+            self._history.setdefault(reminder.user_id, []).append((
+                delivered_at, reminder.id, reminder.message, reminder.delivery_type,
+                reminder.reminder_time
+            ))
+
+        for reminder_id in sent:
+            reminder = claimed(reminder_id)
+            if reminder:
+                archive(reminder)
+                self._unindex(reminder)
+                del self._reminders[reminder_id]
+        for (reminder_id, due), delivered in itertools.chain(
+                zip(rescheduled, itertools.repeat(True)), zip(skipped, itertools.repeat(False))):
+            reminder = claimed(reminder_id)
+            if reminder:
+                if delivered:
+                    archive(reminder)
+                self._unindex(reminder)
+                reminder.reminder_time = reminder.attempt_at = due
+                reminder.status = STATUS_PENDING
+                reminder.attempts = 0
+                self._index(reminder)
+        for reminder_id, attempt_at in retry:
+            reminder = claimed(reminder_id)
+            if reminder:
+                self._unindex(reminder)
+                reminder.status = STATUS_PENDING
+                reminder.attempt_at = attempt_at
+                self._index(reminder)
+        for status, reminder_ids in ((STATUS_FAILED, failed), (STATUS_EXPIRED, expired)):
+            for reminder_id in reminder_ids:
+                reminder = claimed(reminder_id)
+                if reminder:
+                    self._unindex(reminder)
+                    reminder.status = status
+                    self._index(reminder)
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        """Take or renew the named lease, as ReminderDatabase does (there is only one process)"""
+        now = time.time()
+        current = self._leases.get(name)
+        if current is not None and current[0] != holder and current[1] > now:
+            return False
+        self._leases[name] = (holder, now + ttl)
+        return True
+
+    async def release_lease(self, name: str, holder: str):
+        """Give up the named lease if holder has it"""
+        if self._leases.get(name, (None,))[0] == holder:
+            del self._leases[name]
+
+    async def fetch_schedule(self, before: float, since: float = 0) -> List[Tuple]:
+        """Return (id, attempt_at) for live reminders due between since and before"""
+        start = bisect_left(self._due, (since,))
+        end = bisect_right(self._due, (before, float('inf')))
+        return [key[::-1] for key in self._due[start:end] if self._owns(self._reminders[key[1]])]
+
+    async def count_live(self) -> int:
+        """Return the number of pending and in-flight reminders"""
+        return len(self._due)
+
+    async def count_user_live(self, user_id: int) -> int:
+        """Return the number of a user's pending and in-flight reminders"""
+        return sum(1 for _, reminder_id in self._by_user.get(user_id, ())
+                   if self._reminders[reminder_id].live)
+
+    async def count_guild_live(self, guild_id: int) -> int:
+        """Return the number of pending and in-flight reminders for a server"""
+        return self._live_by_guild.get(guild_id, 0)
+
+    async def list_history(self, user_id: int, limit: int) -> List[Tuple]:
+        """Return a user's most recently delivered reminders, newest first"""
+        history = self._history.get(user_id, [])
+        return [(reminder_id, message, delivery_type, reminder_time, delivered_at)
+                for delivered_at, reminder_id, message, delivery_type, reminder_time
+                in reversed(history[-limit:])]
+
+    async def purge_history(self, before: int, batch: int = 500, pause: float = 0.05) -> int:
+        """Delete history delivered before the given time and return how many rows went"""
+        purged = 0
+        for user_id, history in list(self._history.items()):
+            end = bisect_left(history, (before,))
+            purged += end
+            if end == len(history):
+                del self._history[user_id]
+            else:
+                del history[:end]
+            await asyncio.sleep(0)
+        return purged
+
+    async def purge_dead(self, before: int, batch: int = 500, pause: float = 0.05) -> int:
+        """Delete failed and expired reminders due before the given time and return how many went"""
+        dead = [reminder for reminder in self._reminders.values()
+                if reminder.status in (STATUS_FAILED, STATUS_EXPIRED) and reminder.reminder_time < before]
+        for reminder in dead:
+            self._unindex(reminder)
+            del self._reminders[reminder.id]
+        return len(dead)
+
+    async def vacuum(self, pages: int = 1000, pause: float = 0.05) -> int:
+        """Nothing to reclaim in memory"""
+        return 0
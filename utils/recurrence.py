@@ -0,0 +1,196 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import FrozenSet
+
+from utils.timeparse import parse_offset
+
+# Shortest allowed repeat interval, so a typo cannot turn into a DM every second
+MIN_INTERVAL = 60
+
+# Give up on cron expressions that cannot match (e.g. 31 February) after this many steps
+_MAX_CRON_STEPS = 100000
+
+_WEEKDAYS = {
+    'mon': 0, 'monday': 0, 'tue': 1, 'tues': 1, 'tuesday': 1, 'wed': 2, 'wednesday': 2,
+    'thu': 3, 'thur': 3, 'thurs': 3, 'thursday': 3, 'fri': 4, 'friday': 4,
+    'sat': 5, 'saturday': 5, 'sun': 6, 'sunday': 6,
+}
+# Most days each month can have, for rejecting cron dates that never occur
+_MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_DAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_INTERVAL_ALIASES = {'hourly': '1h', 'daily': '1d', 'weekly': '1w', 'monthly': '1mo', 'yearly': '1y'}
+_CRON_FIELD = re.compile(r'^[\d*/,\-a-z]+$')
+_LIST_SEPARATOR = re.compile(r'\s*(?:,|\band\b|\s)\s*')
+
+
+class IntervalRule:
+    """Repeats a fixed number of seconds after the first occurrence"""
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+
+    def next_after(self, anchor: int, after: float) -> int:
+        # Skip occurrences missed while the bot was down instead of sending them all
+        steps = max(0, int((after - anchor) // self.seconds) + 1)
+        return anchor + steps * self.seconds
+
+    def describe(self) -> str:
+        for unit, seconds in (('week', 604800), ('day', 86400), ('hour', 3600), ('minute', 60)):
+            if self.seconds % seconds == 0:
+                count = self.seconds // seconds
+                return f"every {unit}" if count == 1 else f"every {count} {unit}s"
+        return f"every {self.seconds} seconds"
+
+
+class WeekdayRule:
+    """Repeats on chosen days of the week at the first occurrence's local time of day"""
+
+    def __init__(self, days: FrozenSet[int]):
+        self.days = days
+
+    def next_after(self, anchor: int, after: float) -> int:
+        time_of_day = datetime.fromtimestamp(anchor).time()
+        start = datetime.fromtimestamp(max(anchor, after)).date()
+        for offset in range(8):
+            candidate = datetime.combine(start + timedelta(days=offset), time_of_day)
+            if candidate.weekday() in self.days and candidate.timestamp() > after:
+                return int(candidate.timestamp())
+        raise ValueError("No matching weekday")
+
+    def describe(self) -> str:
+        if self.days == frozenset(range(5)):
+            return "every weekday"
+        if self.days == frozenset((5, 6)):
+            return "every weekend day"
+        return "every " + ", ".join(_DAY_NAMES[day] for day in sorted(self.days))
+
+
+class CronRule:
+    """Repeats on a standard 5-field cron schedule in local time"""
+
+    def __init__(self, expression: str, minutes, hours, days, months, weekdays,
+                 any_day: bool, any_weekday: bool):
+        self.expression = expression
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        self.weekdays = weekdays
+        self.any_day = any_day
+        self.any_weekday = any_weekday
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        # Cron weekdays count from Sunday = 0
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        # As in cron, restricting both fields matches either of them
+        if not self.any_day and not self.any_weekday:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def can_match(self) -> bool:
+        """Return whether some date satisfies the day and month fields (not 30 February)"""
+        if self.any_day or not self.any_weekday:
+            # Every month has a matching weekday
+            return True
+        return any(min(self.days) <= _MONTH_DAYS[month - 1] for month in self.months)
+
+    def next_after(self, anchor: int, after: float) -> int:
+        moment = datetime.fromtimestamp(after).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(_MAX_CRON_STEPS):
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return int(moment.timestamp())
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def describe(self) -> str:
+        return f"cron `{self.expression}`"
+
+
+def _parse_cron_field(field: str, low: int, high: int, names: dict = None) -> FrozenSet[int]:
+    values = set()
+    for part in field.split(','):
+        part, _, step = part.partition('/')
+        if part == '*':
+            start, end = low, high
+        else:
+            first, _, last = part.partition('-')
+            start = names[first] if names and first in names else int(first)
+            end = (names[last] if names and last in names else int(last)) if last else start
+            if step and not last:
+                end = high
+        step = int(step) if step else 1
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"Cron field out of range: {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def _parse_cron(text: str) -> CronRule:
+    minute, hour, day, month, weekday = text.split()
+    weekday_names = {name: (number + 1) % 7 for name, number in _WEEKDAYS.items()}
+    weekdays = _parse_cron_field(weekday, 0, 7, weekday_names)
+    # Both 0 and 7 mean Sunday
+    weekdays = frozenset(day_number % 7 for day_number in weekdays)
+    return CronRule(
+        text,
+        _parse_cron_field(minute, 0, 59),
+        _parse_cron_field(hour, 0, 23),
+        _parse_cron_field(day, 1, 31),
+        _parse_cron_field(month, 1, 12),
+        weekdays,
+        any_day=day == '*',
+        any_weekday=weekday == '*',
+    )
+
+
+@lru_cache(maxsize=1024)
+def parse_recurrence(text: str):
+    """
+    Parse a repeat rule into an object with next_after() and describe().
+
+    Accepts intervals ('every 2h', 'every day', 'daily'), days of the week
+    ('weekdays', 'weekends', 'every mon, wed and fri') and 5-field cron
+    expressions ('0 9 * * 1-5'). Raises ValueError for anything else.
+    """
+    rule = text.strip().lower()
+    if rule.startswith('every '):
+        rule = rule[len('every '):].strip()
+
+    fields = rule.split()
+    if len(fields) == 5 and all(_CRON_FIELD.match(field) for field in fields):
+        try:
+            cron = _parse_cron(rule)
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid cron expression: {text}")
+        if not cron.can_match():
+            raise ValueError(f"Cron expression never matches: {text}")
+        return cron
+
+    if rule in ('weekday', 'weekdays'):
+        return WeekdayRule(frozenset(range(5)))
+    if rule in ('weekend', 'weekends'):
+        return WeekdayRule(frozenset((5, 6)))
+    names = [name.rstrip('s') if name.rstrip('s') in _WEEKDAYS else name
+             for name in _LIST_SEPARATOR.split(rule) if name]
+    if names and all(name in _WEEKDAYS for name in names):
+        return WeekdayRule(frozenset(_WEEKDAYS[name] for name in names))
+
+    rule = _INTERVAL_ALIASES.get(rule, rule)
+    seconds = parse_offset(rule)
+    if seconds is None:
+        # "every day", "every week"
+        seconds = parse_offset(f"1 {rule}")
+    if seconds is None:
+        raise ValueError(f"Invalid repeat rule: {text}")
+    if seconds < MIN_INTERVAL:
+        raise ValueError("Reminders can repeat at most once a minute")
+    return IntervalRule(seconds)
@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import discord
+
+from utils.metrics import registry
+
+RESOLVER_LOOKUPS = registry.counter(
+    'reminder_resolver_lookups_total', "User, channel and DM lookups by where they were answered",
+    ['kind', 'source']
+)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A size-bounded LRU mapping whose entries expire a fixed time after being set"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value):
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._data.pop(key, None)
+
+
+class DiscordResolver:
+    """
+    Resolves the users, channels and DM channels reminders are sent to.
+
+    Each lookup tries discord.py's own cache, then this resolver's LRU/TTL
+    caches, then the API, so reminders still reach users who are not in the
+    member cache (always the case with MEMBER_CACHE=lean, and right after a
+    restart otherwise). Opened DM channels are
+    kept here because discord.py only remembers the last 128, which a burst of
+    DM reminders would cycle through, reopening a DM for every send. Users and
+    channels that do not exist, and users who refuse DMs, are cached as
+    missing so they cost no API calls until the negative entry expires.
+    """
+
+    def __init__(self, bot: discord.Client, maxsize: int = 10000, ttl: float = 3600.0,
+                 negative_ttl: float = 3600.0):
+        self.bot = bot
+        self._users = TTLCache(maxsize, ttl)
+        self._channels = TTLCache(maxsize, ttl)
+        self._dm_channels = TTLCache(maxsize, ttl)
+        self._missing = TTLCache(maxsize, negative_ttl)
+
+    async def user(self, user_id: int) -> Optional[discord.abc.User]:
+        """Return a user, or None if Discord does not know them"""
+        user = self.bot.get_user(user_id) or self._users.get(user_id)
+        if user is not None:
+            RESOLVER_LOOKUPS.inc(kind='user', source='cache')
+            return user
+        if self._missing.get(('user', user_id)):
+            RESOLVER_LOOKUPS.inc(kind='user', source='negative')
+            return None
+
+        RESOLVER_LOOKUPS.inc(kind='user', source='api')
+        try:
+            user = await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            self._missing.set(('user', user_id), True)
+            return None
+        self._users.set(user_id, user)
+        return user
+
+    async def channel(self, channel_id: int):
+        """Return a channel, or None if it no longer exists or is not visible to the bot"""
+        channel = self.bot.get_channel(channel_id) or self._channels.get(channel_id)
+        if channel is not None:
+            RESOLVER_LOOKUPS.inc(kind='channel', source='cache')
+            return channel
+        if self._missing.get(('channel', channel_id)):
+            RESOLVER_LOOKUPS.inc(kind='channel', source='negative')
+            return None
+
+        RESOLVER_LOOKUPS.inc(kind='channel', source='api')
+        try:
+            channel = await self.bot.fetch_channel(channel_id)
+        except (discord.NotFound, discord.Forbidden):
+            self._missing.set(('channel', channel_id), True)
+            return None
+        self._channels.set(channel_id, channel)
+        return channel
+
+    async def dm_channel(self, user_id: int):
+        """Return an open DM channel with a user, or None if they cannot be DMed"""
+        if self.dms_closed(user_id):
+            RESOLVER_LOOKUPS.inc(kind='dm', source='negative')
+            return None
+        channel = self._dm_channels.get(user_id, _MISSING)
+        if channel is not _MISSING:
+            RESOLVER_LOOKUPS.inc(kind='dm', source='cache')
+            return channel
+
+        user = await self.user(user_id)
+        if user is None:
+            return None
+        channel = user.dm_channel
+        if channel is None:
+            RESOLVER_LOOKUPS.inc(kind='dm', source='api')
+            channel = await user.create_dm()
+        else:
+            RESOLVER_LOOKUPS.inc(kind='dm', source='cache')
+        self._dm_channels.set(user_id, channel)
+        return channel
+
+    def dms_closed(self, user_id: int) -> bool:
+        """Return whether a user recently refused a DM"""
+        return bool(self._missing.get(('dm', user_id)))
+
+    def close_dms(self, user_id: int):
+        """Remember that a user refused a DM (blocked the bot or closed their DMs)"""
+        self._missing.set(('dm', user_id), True)
+        self._dm_channels.pop(user_id)
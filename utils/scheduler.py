@@ -0,0 +1,93 @@
+import asyncio
+import heapq
+import time
+from typing import Iterable, Optional, Tuple
+
+
+class ReminderScheduler:
+    """
+    In-memory min-heap of upcoming reminder due times.
+
+    Only reminders due before ``horizon`` are held in memory, so a table with
+    millions of far-future rows costs one indexed query per horizon instead of
+    a heap entry per row. Cancelled or rescheduled entries are dropped lazily
+    when they reach the top of the heap.
+
+    When other processes also write reminders that this process dispatches
+    (shard workers), ``sync_interval`` caps every sleep so rows this heap never
+    heard about are still picked up promptly by the due-scan.
+    """
+
+    def __init__(self, window: float = 3600.0, sync_interval: Optional[float] = None):
+        self.window = window
+        self.sync_interval = sync_interval
+        self.horizon = 0.0
+        self._heap: list = []
+        self._entries: dict = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def reset(self, now: float, rows: Iterable[Tuple[int, float]]):
+        """Replace the heap with rows due before the next horizon"""
+        self.horizon = now + self.window
+        self._entries = {reminder_id: due for reminder_id, due in rows}
+        self._heap = [(due, reminder_id) for reminder_id, due in self._entries.items()]
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def invalidate(self):
+        """Force a refill from the database on the next wake-up"""
+        self.horizon = 0.0
+        self._wakeup.set()
+
+    def schedule(self, reminder_id: int, due: float):
+        """Add or move a reminder, waking the sleeper if it is now the earliest"""
+        if due > self.horizon:
+            # Picked up by the next refill; make sure a stale entry cannot fire
+            self._entries.pop(reminder_id, None)
+            return
+        self._entries[reminder_id] = due
+        heapq.heappush(self._heap, (due, reminder_id))
+        if self._heap[0] == (due, reminder_id):
+            self._wakeup.set()
+
+    def cancel(self, reminder_id: int):
+        """Forget a reminder; its heap entry is discarded lazily"""
+        self._entries.pop(reminder_id, None)
+
+    def next_due(self) -> Optional[float]:
+        """Return the earliest live due time, pruning stale heap entries"""
+        while self._heap:
+            due, reminder_id = self._heap[0]
+            if self._entries.get(reminder_id) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float) -> list:
+        """Remove and return the IDs of every reminder due at or before now"""
+        due_ids = []
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                return due_ids
+            _, reminder_id = heapq.heappop(self._heap)
+            del self._entries[reminder_id]
+            due_ids.append(reminder_id)
+
+    async def sleep(self):
+        """Sleep until the next reminder or horizon, or until the heap changes"""
+        due = self.next_due()
+        wake_at = self.horizon if due is None else min(due, self.horizon)
+        if self.sync_interval:
+            wake_at = min(wake_at, time.time() + self.sync_interval)
+        timeout = wake_at - time.time()
+        if timeout <= 0:
+            return
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
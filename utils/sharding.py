@@ -0,0 +1,30 @@
+from typing import Iterable, Optional
+
+
+def shard_for(guild_id: Optional[int], user_id: int, shard_count: int) -> int:
+    """
+    Return the shard that dispatches a reminder.
+
+    Server reminders belong to the shard whose gateway connection carries the
+    guild, using Discord's own (id >> 22) % shard_count formula. DM reminders
+    have no guild, so the same formula is applied to the user ID, which gives
+    a stable assignment that spreads users evenly across shards.
+    """
+    if shard_count <= 1:
+        return 0
+    return ((guild_id if guild_id is not None else user_id) >> 22) % shard_count
+
+
+class ShardFilter:
+    """Decides which reminders this process owns"""
+
+    def __init__(self, shard_count: Optional[int] = None, shard_ids: Optional[Iterable[int]] = None):
+        self.shard_count = shard_count or 1
+        self.shard_ids = frozenset(shard_ids if shard_ids is not None else range(self.shard_count))
+
+    @property
+    def owns_all(self) -> bool:
+        return self.shard_ids.issuperset(range(self.shard_count))
+
+    def owns(self, guild_id: Optional[int], user_id: int) -> bool:
+        return shard_for(guild_id, user_id, self.shard_count) in self.shard_ids
@@ -0,0 +1,98 @@
+from typing import Iterable, List, Optional, Protocol, Tuple
+
+from utils.database import ReminderDatabase
+from utils.memstore import MemoryReminderStore
+from utils.sharding import ShardFilter
+
+# Values of REMINDER_STORAGE
+BACKENDS = ('sqlite', 'memory')
+
+
+class ReminderStore(Protocol):
+    """
+    What ReminderSystem needs from reminder storage.
+
+    Rows are plain tuples in the column order ReminderDatabase's queries
+    return, so the cog works the same on any backend. Every method is a
+    coroutine; backends decide whether they actually wait on I/O.
+    """
+
+    async def open(self):
+        """Prepare the store for use"""
+
+    async def close(self):
+        """Persist anything outstanding and release resources"""
+
+    async def insert_reminder(self, user_id: int, channel_id: Optional[int], message: str,
+                              delivery_type: str, reminder_time: int,
+                              guild_id: Optional[int] = None, recurrence: Optional[str] = None) -> int:
+        """Store a pending reminder and return its ID"""
+
+    async def list_reminders(self, user_id: int, limit: int,
+                             after: Optional[Tuple[int, int]] = None,
+                             before: Optional[Tuple[int, int]] = None) -> List[Tuple]:
+        """Return (id, message, delivery_type, reminder_time, created_at, status, recurrence) rows"""
+
+    async def update_reminder(self, reminder_id: int, user_id: int, message: str,
+                              delivery_type: str, reminder_time: int,
+                              channel_id: Optional[int], guild_id: Optional[int] = None,
+                              recurrence: Optional[str] = None) -> int:
+        """Edit a user's reminder and return how many were changed"""
+
+    async def delete_reminder(self, reminder_id: int, user_id: int) -> int:
+        """Delete a user's reminder and return how many were deleted"""
+
+    async def reminder_state(self, reminder_id: int, user_id: int) -> Optional[Tuple]:
+        """Return (guild_id, status) for a user's reminder, or None if they have no such reminder"""
+
+    async def claim_due(self, now: float, lease_until: int, limit: int,
+                        since: float = 0) -> List[Tuple]:
+        """
+        Claim due reminders until lease_until and return (id, user_id, channel_id,
+        message, delivery_type, reminder_time, attempts, recurrence) rows
+        """
+
+    async def ack(self, sent: Iterable[int] = (), retry: Iterable[Tuple[int, int]] = (),
+                  failed: Iterable[int] = (), rescheduled: Iterable[Tuple[int, int]] = (),
+                  expired: Iterable[int] = (), skipped: Iterable[Tuple[int, int]] = ()):
+        """Record the outcome of a batch of claimed reminders"""
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        """Take or renew the named lease for ttl seconds and return whether holder has it"""
+
+    async def release_lease(self, name: str, holder: str):
+        """Give up the named lease if holder has it"""
+
+    async def fetch_schedule(self, before: float, since: float = 0) -> List[Tuple]:
+        """Return (id, attempt_at) for live reminders due between since and before"""
+
+    async def count_live(self) -> int:
+        """Return the number of pending and in-flight reminders"""
+
+    async def count_user_live(self, user_id: int) -> int:
+        """Return the number of a user's pending and in-flight reminders"""
+
+    async def count_guild_live(self, guild_id: int) -> int:
+        """Return the number of pending and in-flight reminders for a server"""
+
+    async def list_history(self, user_id: int, limit: int) -> List[Tuple]:
+        """Return (reminder_id, message, delivery_type, reminder_time, delivered_at) rows, newest first"""
+
+    async def purge_history(self, before: int, batch: int = 500, pause: float = 0.05) -> int:
+        """Delete history delivered before the given time and return how many rows went"""
+
+    async def purge_dead(self, before: int, batch: int = 500, pause: float = 0.05) -> int:
+        """Delete failed and expired reminders due before the given time and return how many went"""
+
+    async def vacuum(self, pages: int = 1000, pause: float = 0.05) -> int:
+        """Reclaim space left by deletes and return how many pages were freed"""
+
+
+def create_store(backend: str, path: str, shards: Optional[ShardFilter] = None,
+                 write_delay: float = 0.0, synchronous: str = 'FULL') -> ReminderStore:
+    """Create the storage backend named by REMINDER_STORAGE"""
+    if backend == 'sqlite':
+        return ReminderDatabase(path, shards, write_delay=write_delay, synchronous=synchronous)
+    if backend == 'memory':
+        return MemoryReminderStore(shards)
+    raise ValueError(f"Unknown reminder storage {backend!r}, expected one of: {', '.join(BACKENDS)}")
@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+
+class TokenBuckets:
+    """
+    One token bucket per key, holding up to burst tokens and refilled at rate per second.
+
+    Checks are plain arithmetic on a dict entry, so a rejected command costs
+    no I/O. Only the maxsize most recently used keys are kept; a bucket that
+    falls out has had time to refill for all but the busiest bots.
+    """
+
+    def __init__(self, rate: float, burst: int, maxsize: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._buckets: OrderedDict = OrderedDict()
+
+    def take(self, key: Hashable) -> float:
+        """Take a token for key; return 0 if one was available, else seconds until one is"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        retry_after = 0.0
+        if tokens < 1:
+            retry_after = (1 - tokens) / self.rate
+        else:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class LiveCounts:
+    """
+    Cached counts of live reminders per owner (user or guild), for quotas.
+
+    A count is loaded with one indexed query on first use, then kept up to
+    date by this process: reserve() checks the limit and counts the new
+    reminder in one step, so concurrent commands cannot both take the last
+    slot, and adjust() applies deletes, moves and failed writes. Deliveries
+    and other processes' writes are picked up when the entry is reloaded
+    after ttl seconds. Only the maxsize most recently used counts are kept.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._counts: OrderedDict = OrderedDict()
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[int]]) -> int:
+        """Return the count for key, calling load() if it is missing or stale"""
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry[0]
+        count = await load()
+        # Another caller may have loaded and adjusted the count while this one waited
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry[0]
+        self._counts[key] = (count, time.monotonic() + self.ttl)
+        while len(self._counts) > self.maxsize:
+            self._counts.popitem(last=False)
+        return count
+
+    async def reserve(self, key: Hashable, limit: int, load: Callable[[], Awaitable[int]]) -> bool:
+        """Count one more for key and return True, or return False if it is already at limit"""
+        count = await self.get(key, load)
+        if count >= limit:
+            return False
+        self.adjust(key, 1)
+        return True
+
+    def adjust(self, key: Hashable, delta: int):
+        """Apply a change made by this process to a cached count, if there is one"""
+        entry = self._counts.get(key)
+        if entry is not None:
+            self._counts[key] = (max(0, entry[0] + delta), entry[1])
+
+    def forget(self, key: Hashable):
+        """Drop a cached count so the next get() reloads it"""
+        self._counts.pop(key, None)
+
+    def _fresh(self, key: Hashable) -> Optional[Tuple[int, float]]:
+        """Return key's entry, marked most recently used, unless it is missing or stale"""
+        entry = self._counts.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        self._counts.move_to_end(key)
+        return entry
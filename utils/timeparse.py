@@ -0,0 +1,207 @@
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Seconds per unit. Months and years are approximated as 30 and 365 days.
+UNITS = {
+    's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
+    'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+    'd': 86400, 'day': 86400, 'days': 86400,
+    'w': 604800, 'wk': 604800, 'wks': 604800, 'week': 604800, 'weeks': 604800,
+    'mo': 2592000, 'mon': 2592000, 'mos': 2592000, 'month': 2592000, 'months': 2592000,
+    'y': 31536000, 'yr': 31536000, 'yrs': 31536000, 'year': 31536000, 'years': 31536000,
+}
+
+# One "<number> <unit>" term, optionally followed by a comma or "and". Units
+# are tried longest first so "mo" is never read as "m" followed by junk.
+_TERM = re.compile(
+    r'\s*(\d+)\s*(' + '|'.join(sorted(UNITS, key=len, reverse=True)) + r')(?![a-z])\s*(?:,|and\b)?'
+)
+_ABSOLUTE = re.compile(r'^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$')
+# Text ending in a number with an optional, partly typed unit, e.g. '2h 3' or '1 ho'
+_PARTIAL = re.compile(r'^(.*?)(\d+)\s*([a-z]*)$')
+
+# Durations offered while typing, best first; indexed by every prefix below
+SUGGESTIONS = (
+    '10m', '30m', '1h', '2h', '4h', '1d', '2d', '1w', '2w', '1mo', '3mo', '6mo', '1y',
+    '5m', '15m', '45m', '12h', '3d', '30s',
+)
+# Units a bare trailing number is completed with, most useful first
+COMPLETION_UNITS = ('m', 'h', 'd', 'w', 'mo', 'y', 's')
+# Discord's limits on autocomplete choices
+MAX_CHOICES = 25
+MAX_CHOICE_LENGTH = 100
+
+
+def load_dateparser():
+    """
+    Import dateparser on first use.
+
+    Its regex tables and locale data cost hundreds of milliseconds and tens of
+    MB, and only free-form input that the tokenizer cannot read needs it.
+    """
+    import dateparser
+    return dateparser
+
+
+@lru_cache(maxsize=4096)
+def parse_offset(text: str) -> Optional[int]:
+    """
+    Parse a lowercase relative duration like '2h 30m' or '1 year 2 months' to seconds.
+
+    Returns None when the text is not made up entirely of number/unit terms.
+    """
+    total = 0
+    position = 0
+    end = len(text)
+    while position < end:
+        match = _TERM.match(text, position)
+        if not match:
+            return None
+        total += int(match.group(1)) * UNITS[match.group(2)]
+        position = match.end()
+    return total if position else None
+
+
+def _build_suggestion_index(suggestions: Tuple[str, ...]) -> Dict[str, Tuple[Tuple[str, int], ...]]:
+    """Map every prefix of every suggestion to the (suggestion, seconds) pairs it starts"""
+    index: Dict[str, List[Tuple[str, int]]] = {}
+    for text in suggestions:
+        seconds = parse_offset(text)
+        for end in range(len(text) + 1):
+            index.setdefault(text[:end], []).append((text, seconds))
+    return {prefix: tuple(entries) for prefix, entries in index.items()}
+
+
+_SUGGESTION_INDEX = _build_suggestion_index(SUGGESTIONS)
+
+
+@lru_cache(maxsize=4096)
+def complete_offset(text: str) -> Tuple[Tuple[str, int], ...]:
+    """
+    Return (input, seconds) durations that partly typed lowercase text can become, best first.
+
+    The text itself comes first if it already parses, then suggestions it is a
+    prefix of, then its trailing number completed with each unit ('2h 3' ->
+    '2h 3m', '2h 3h', ...) or its partly typed unit finished ('1 ho' -> '1 hours').
+    """
+    results = []
+    offset = parse_offset(text) if text else None
+    if offset is not None:
+        results.append((text, offset))
+    results.extend(_SUGGESTION_INDEX.get(text, ()))
+
+    match = _PARTIAL.match(text)
+    if offset is None and match:
+        head, _, unit = match.groups()
+        if not head.strip() or parse_offset(head.rstrip()) is not None:
+            if unit:
+                # Longest first, so the full unit name wins among equal durations
+                names = sorted((name for name in UNITS if name.startswith(unit)), key=len, reverse=True)
+            else:
+                names = COMPLETION_UNITS
+            completed = set()
+            for name in names:
+                candidate = text + name[len(unit):]
+                seconds = parse_offset(candidate)
+                if seconds is not None and seconds not in completed:
+                    completed.add(seconds)
+                    results.append((candidate, seconds))
+
+    seen = set()
+    unique = []
+    for candidate, seconds in results:
+        if candidate not in seen:
+            seen.add(candidate)
+            unique.append((candidate, seconds))
+    return tuple(unique[:MAX_CHOICES])
+
+
+def _choice_label(text: str, when: datetime, now: datetime) -> str:
+    """Describe what text resolves to in at most MAX_CHOICE_LENGTH characters"""
+    resolved = f" → {when.astimezone(timezone.utc):%a %d %b %Y, %H:%M} UTC"
+    if when < now:
+        resolved += " (past)"
+    room = MAX_CHOICE_LENGTH - len(resolved)
+    if len(text) > room:
+        text = text[:room - 1] + "…"
+    return text + resolved
+
+
+def suggest_times(current: str, now: Optional[datetime] = None) -> List[Tuple[str, str]]:
+    """
+    Return (label, value) autocomplete choices for a partly typed time argument.
+
+    Labels show the absolute UTC time each choice resolves to. Only the
+    tokenizer and the absolute format are tried, never dateparser, so every
+    call stays well under a millisecond; natural language input is offered
+    back unchanged and parsed when the command is sent.
+    """
+    text = current.strip()
+    if len(text) > MAX_CHOICE_LENGTH:
+        return []
+    now = now or datetime.now()
+
+    if _ABSOLUTE.match(text):
+        try:
+            when = datetime.strptime(text, '%d-%m-%Y %H:%M')
+        except ValueError:
+            return [(f"{text} is not a valid date (DD-MM-YYYY HH:MM)", text)]
+        try:
+            return [(_choice_label(text, when, now), text)]
+        except (OverflowError, ValueError):
+            # Dates at the edge of datetime's range cannot be shifted to UTC ('01-01-0001 00:00')
+            return []
+
+    choices = []
+    for candidate, seconds in complete_offset(text.lower()):
+        try:
+            choices.append((_choice_label(candidate, now + timedelta(seconds=seconds), now), candidate))
+        except (OverflowError, ValueError):
+            # Beyond the last date datetime can represent ('8000y')
+            continue
+    if text and not choices:
+        hint = " (read when sent; e.g. 2h 30m or DD-MM-YYYY HH:MM)"
+        choices.append((text[:MAX_CHOICE_LENGTH - len(hint)] + hint, text))
+    return choices
+
+
+def parse_time(time_str: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a time string into a naive local datetime.
+
+    Supports units like 30s, 5m, 2h, 1d, 1w, 1mo and 1y in any combination
+    ('2h 30m 20s', '1 year 2 months 3 weeks'), and absolute dates in
+    DD-MM-YYYY HH:MM format. Anything else falls back to dateparser, whose
+    result must lie in the future.
+    """
+    text = time_str.strip()
+    current_time = now or datetime.now()
+
+    # Handle absolute date/time format (DD-MM-YYYY HH:MM)
+    if _ABSOLUTE.match(text):
+        try:
+            return datetime.strptime(text, '%d-%m-%Y %H:%M')
+        except ValueError:
+            raise ValueError("Invalid date format. Use DD-MM-YYYY HH:MM")
+
+    offset = parse_offset(text.lower())
+    if offset is not None:
+        try:
+            return current_time + timedelta(seconds=offset)
+        except OverflowError:
+            raise ValueError(f"Time is too far in the future: {time_str}")
+
+    # Last resort: natural language such as "tomorrow at 5pm". dateparser also
+    # reads stray fragments ('h') as today's midnight, so only future times count
+    try:
+        parsed = load_dateparser().parse(
+            text, settings={'RELATIVE_BASE': current_time, 'PREFER_DATES_FROM': 'future'}
+        )
+    except Exception:
+        parsed = None
+    if parsed is None or parsed <= current_time:
+        raise ValueError(f"Invalid time format: {time_str}")
+    return parsed
@@ -0,0 +1,272 @@
+"""
+Stream reminders between reminders.db and JSONL or CSV files.
+
+Export walks a cursor row by row and import inserts in chunked transactions,
+so memory stays flat however many reminders there are. Imported times go
+through the same parsing as /remind, and imported reminders get new IDs.
+
+Usage: python -m utils.transfer export reminders.db backup.jsonl [--user ID]
+       python -m utils.transfer import reminders.db backup.csv [--chunk-size 5000]
+
+Import into a stopped bot, or use /reminders_import: a running bot only picks
+up reminders added behind its back at its next hourly schedule refresh.
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from utils.database import STATUS_EXPIRED, STATUS_FAILED, STATUS_PENDING, migrate
+from utils.recurrence import parse_recurrence
+from utils.timeparse import parse_time
+
+FIELDS = (
+    'id', 'user_id', 'channel_id', 'guild_id', 'message', 'delivery_type',
+    'reminder_time', 'recurrence', 'status', 'created_at',
+)
+FORMATS = ('jsonl', 'csv')
+
+# Errors reported back after an import; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+EXPORT_REMINDERS = '''
+    SELECT id, user_id, channel_id, guild_id, message, delivery_type,
+           reminder_time, recurrence, status, created_at
+    FROM reminders
+    ORDER BY id
+'''
+
+EXPORT_USER_REMINDERS = '''
+    SELECT id, user_id, channel_id, guild_id, message, delivery_type,
+           reminder_time, recurrence, status, created_at
+    FROM reminders
+    WHERE user_id = ?
+    ORDER BY reminder_time, id
+'''
+
+IMPORT_REMINDER = '''
+    INSERT INTO reminders (user_id, channel_id, guild_id, message, delivery_type,
+                           reminder_time, attempt_at, recurrence, status, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a database the way the bot does, creating or upgrading the schema"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    migrate(conn)
+    return conn
+
+
+def format_for(path: str, default: str = 'jsonl') -> str:
+    """Pick a format from a file name's extension"""
+    return 'csv' if path.lower().endswith('.csv') else default
+
+
+def _to_iso(epoch: Optional[int]) -> Optional[str]:
+    return None if epoch is None else datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def normalize_time(value, now: Optional[datetime] = None) -> int:
+    """
+    Convert an imported time to UTC epoch seconds.
+
+    Accepts epoch numbers, ISO 8601 timestamps (naive ones are local time) and
+    everything /remind accepts, relative to now.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    text = str(value or '').strip()
+    if not text:
+        raise ValueError("missing time")
+    if text.isdigit():
+        return int(text)
+    try:
+        return math.ceil(datetime.fromisoformat(text).timestamp())
+    except ValueError:
+        return math.ceil(parse_time(text, now).timestamp())
+
+
+def _optional_int(value) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def normalize_record(record: dict, now: Optional[datetime] = None) -> tuple:
+    """Validate one imported reminder and return IMPORT_REMINDER parameters"""
+    user_id = _optional_int(record.get('user_id'))
+    if user_id is None:
+        raise ValueError("missing user_id")
+    message = str(record.get('message') or '').strip()
+    if not message:
+        raise ValueError("missing message")
+    delivery_type = str(record.get('delivery_type') or 'dm').strip().lower()
+    if delivery_type not in ('dm', 'server'):
+        raise ValueError(f"invalid delivery_type {delivery_type!r}")
+    channel_id = _optional_int(record.get('channel_id'))
+    if delivery_type == 'server' and channel_id is None:
+        raise ValueError("server reminders need a channel_id")
+    guild_id = _optional_int(record.get('guild_id'))
+
+    reminder_time = normalize_time(record.get('reminder_time'), now)
+    recurrence = str(record.get('recurrence') or '').strip().lower() or None
+    if recurrence:
+        parse_recurrence(recurrence)
+    # In-flight claims from the exporting bot are delivered again here
+    status = record.get('status')
+    status = status if status in (STATUS_FAILED, STATUS_EXPIRED) else STATUS_PENDING
+    created_at = record.get('created_at')
+    created_at = normalize_time(created_at, now) if created_at not in (None, '') else int(time.time())
+
+    return (user_id, channel_id if delivery_type == 'server' else None, guild_id, message,
+            delivery_type, reminder_time, reminder_time, recurrence, status, created_at)
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line number, record or ValueError) from a JSONL or CSV stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"invalid JSON: {e.msg}")
+            continue
+        if not isinstance(record, dict):
+            record = ValueError("expected a JSON object")
+        yield line_number, record
+
+
+def export_reminders(conn: sqlite3.Connection, stream: IO[str], fmt: str = 'jsonl',
+                     user_id: Optional[int] = None) -> int:
+    """Write reminders to a stream one row at a time and return how many were written"""
+    if user_id is None:
+        cursor = conn.execute(EXPORT_REMINDERS)
+    else:
+        cursor = conn.execute(EXPORT_USER_REMINDERS, (user_id,))
+
+    writer = csv.writer(stream) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(FIELDS)
+    count = 0
+    for row in cursor:
+        row = list(row)
+        row[6] = _to_iso(row[6])
+        row[9] = _to_iso(row[9])
+        if writer:
+            writer.writerow(['' if value is None else value for value in row])
+        else:
+            stream.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False))
+            stream.write('\n')
+        count += 1
+    return count
+
+
+def import_reminders(conn: sqlite3.Connection, records: Iterable[Tuple[int, object]],
+                     chunk_size: int = 5000) -> Tuple[int, int, List[str]]:
+    """
+    Insert validated records in transactions of chunk_size rows.
+
+    Returns (imported, skipped, errors), where errors describes at most
+    MAX_REPORTED_ERRORS of the skipped records.
+    """
+    imported = skipped = 0
+    errors = []
+    now = datetime.now()
+    chunk = []
+
+    def flush():
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(IMPORT_REMINDER, chunk)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        chunk.clear()
+
+    for line_number, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            chunk.append(normalize_record(record, now))
+        except (TypeError, ValueError) as e:
+            skipped += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"line {line_number}: {e}")
+            continue
+        if len(chunk) >= chunk_size:
+            imported += len(chunk)
+            flush()
+    if chunk:
+        imported += len(chunk)
+        flush()
+    return imported, skipped, errors
+
+
+def export_file(database: str, path: str, fmt: Optional[str] = None,
+                user_id: Optional[int] = None) -> int:
+    """Export a database's reminders to a file (- for stdout) on a connection of its own"""
+    fmt = fmt or format_for(path)
+    conn = connect(database)
+    try:
+        if path == '-':
+            return export_reminders(conn, sys.stdout, fmt, user_id)
+        with open(path, 'w', encoding='utf-8', newline='') as stream:
+            return export_reminders(conn, stream, fmt, user_id)
+    finally:
+        conn.close()
+
+
+def import_file(database: str, path: str, fmt: Optional[str] = None,
+                chunk_size: int = 5000) -> Tuple[int, int, List[str]]:
+    """Import reminders from a file (- for stdin) on a connection of its own"""
+    fmt = fmt or format_for(path)
+    if path == '-':
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    else:
+        stream = open(path, encoding='utf-8', newline='')
+    conn = connect(database)
+    try:
+        with stream:
+            return import_reminders(conn, read_records(stream, fmt), chunk_size)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('action', choices=('export', 'import'))
+    parser.add_argument('database', help="path to reminders.db")
+    parser.add_argument('file', help="JSONL or CSV file, or - for stdin/stdout")
+    parser.add_argument('--format', choices=FORMATS, help="default: from the file extension, else jsonl")
+    parser.add_argument('--user', type=int, help="export only this user's reminders")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="rows per import transaction")
+    args = parser.parse_args()
+
+    if args.action == 'export':
+        count = export_file(args.database, args.file, args.format, args.user)
+        print(f"Exported {count} reminders", file=sys.stderr)
+    else:
+        imported, skipped, errors = import_file(args.database, args.file, args.format, args.chunk_size)
+        for error in errors:
+            print(error, file=sys.stderr)
+        print(f"Imported {imported} reminders, skipped {skipped}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()